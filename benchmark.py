@@ -0,0 +1,638 @@
+"""Offline benchmark of the blog pipeline.
+
+Runs every stage of stockmarket.py without Twitter, Groq or Hugging Face:
+a fake WebDriver serves recorded (or synthetic) timeline HTML, a stub Groq
+client returns canned completions with configurable latency, and a local
+HTTP server stands in for the image inference endpoint.
+
+    python benchmark.py --tweets 5000 --keywords 40
+    python stockmarket.py bench --tweets 5000 --keywords 40
+    python benchmark.py --html recorded_timeline.html --keywords AI,NVDA
+"""
+import argparse
+import contextlib
+import html
+import io
+import json
+import os
+import random
+import re
+import struct
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import stockmarket
+
+WORDS = (
+    "market stocks rally earnings growth revenue chips cloud model launch investors quarter guidance "
+    "shares record demand supply inference training data center partnership analyst upgrade forecast "
+    "margin outlook product users platform release research billion funding startup valuation"
+).split()
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+def synthetic_keywords(count):
+    """Ticker-like keywords that do not occur in WORDS"""
+    return [f"KW{index:03d}" for index in range(count)]
+
+def synthetic_tweets(count, keywords, duplicate_rate=0.1, seed=0):
+    """Tweet records mentioning keywords, with links, mentions, hashtags and near-duplicates"""
+    rng = random.Random(seed)
+    records = []
+    for index in range(count):
+        if records and rng.random() < duplicate_rate:
+            # Near-duplicate: an earlier tweet with one word swapped
+            words = rng.choice(records)["text"].split()
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+        else:
+            words = [rng.choice(WORDS) for _ in range(rng.randint(12, 40))]
+            words.insert(rng.randrange(len(words)), rng.choice(keywords))
+            if rng.random() < 0.5:
+                words.append(f"https://t.co/{rng.getrandbits(40):x}")
+            if rng.random() < 0.4:
+                words.insert(0, f"@user{rng.randrange(1000)}")
+            if rng.random() < 0.4:
+                words.append(f"#{rng.choice(WORDS)}")
+        records.append({
+            "text": ' '.join(words),
+            "id": str(1700000000000000000 + index),
+            "author": f"user{rng.randrange(1000)}",
+            "timestamp": f"2024-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}.000Z",
+        })
+    return records
+
+def timeline_html(records):
+    """Render tweet records the way the Twitter timeline marks them up"""
+    articles = []
+    for record in records:
+        articles.append(
+            '<article data-testid="tweet"><div>'
+            f'<a href="/{record["author"]}">@{record["author"]}</a>'
+            f'<a href="/{record["author"]}/status/{record["id"]}"><time datetime="{record["timestamp"]}">1h</time></a>'
+            f'</div><div data-testid="tweetText"><span>{html.escape(record["text"])}</span></div></article>'
+        )
+    return f'<html><body><main>{"".join(articles)}</main></body></html>'
+
+class TimelineHTMLParser(HTMLParser):
+    """Pull the same fields as EXTRACT_TWEETS_JS out of saved timeline HTML"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.record = None
+        self.text_depth = 0
+        self.link = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'article' and attrs.get('data-testid') == 'tweet':
+            self.record = {"text": None, "id": None, "author": None, "timestamp": None, "parts": [], "links": []}
+        if self.record is None:
+            return
+        if self.text_depth:
+            if tag == 'div':
+                self.text_depth += 1
+            elif tag == 'br':
+                self.record["parts"].append('\n')
+            elif tag == 'img' and attrs.get('alt'):
+                # Emoji are images whose alt text is part of innerText
+                self.record["parts"].append(attrs['alt'])
+        elif tag == 'div' and attrs.get('data-testid') == 'tweetText':
+            self.text_depth = 1
+        elif tag == 'a' and '/status/' in (attrs.get('href') or ''):
+            self.link = attrs['href']
+            self.record["links"].append(self.link)
+        elif tag == 'time':
+            self.record["timestamp"] = attrs.get('datetime')
+            # The permalink is the link around the timestamp
+            if self.link:
+                self.record["links"].insert(0, self.link)
+
+    def handle_endtag(self, tag):
+        if self.record is None:
+            return
+        if tag == 'a':
+            self.link = None
+        elif tag == 'div' and self.text_depth:
+            self.text_depth -= 1
+            if not self.text_depth:
+                self.record["text"] = ''.join(self.record["parts"])
+        elif tag == 'article':
+            record, self.record = self.record, None
+            if record["text"] is None:
+                return
+            for link in record.pop("links"):
+                parts = link.strip('/').split('/')
+                if len(parts) >= 3 and parts[1] == 'status' and parts[2].isdigit():
+                    record["author"], record["id"] = parts[0], parts[2]
+                    break
+            del record["parts"]
+            self.records.append(record)
+
+    def handle_data(self, data):
+        if self.record is not None and self.text_depth:
+            self.record["parts"].append(data)
+
+def parse_timeline_html(text):
+    parser = TimelineHTMLParser()
+    parser.feed(text)
+    parser.close()
+    return parser.records
+
+def timeline_json(records):
+    """A SearchTimeline GraphQL response carrying records, as the network capture sees it"""
+    entries = []
+    for index, record in enumerate(records):
+        created_at = time.strftime(
+            '%a %b %d %H:%M:%S +0000 %Y', time.strptime(record["timestamp"][:19], '%Y-%m-%dT%H:%M:%S')
+        )
+        tweet = {
+            "__typename": "Tweet",
+            "rest_id": record["id"],
+            "core": {"user_results": {"result": {"legacy": {"screen_name": record["author"]}}}},
+            "views": {"count": str(100 + index)},
+            "legacy": {
+                "id_str": record["id"],
+                "created_at": created_at,
+                "full_text": html.escape(record["text"][:280], quote=False),
+                "favorite_count": index % 50,
+                "retweet_count": index % 7,
+                "reply_count": index % 5,
+                "quote_count": index % 3,
+            },
+        }
+        # Long posts arrive truncated with the full text in a note tweet
+        if len(record["text"]) > 280:
+            tweet["note_tweet"] = {"note_tweet_results": {"result": {"text": record["text"]}}}
+        if index % 10 == 0:
+            tweet = {"__typename": "TweetWithVisibilityResults", "tweet": tweet}
+        entries.append({
+            "entryId": f"tweet-{record['id']}",
+            "content": {"entryType": "TimelineTimelineItem", "itemContent": {
+                "itemType": "TimelineTweet", "tweet_results": {"result": tweet}
+            }},
+        })
+    entries.append({"entryId": "cursor-bottom-0", "content": {"entryType": "TimelineTimelineCursor"}})
+    return json.dumps({"data": {"search_by_raw_query": {"search_timeline": {"timeline": {
+        "instructions": [{"type": "TimelineAddEntries", "entries": entries}]
+    }}}}})
+
+def make_png(width, height, seed=0):
+    """Noisy RGB PNG, roughly the size of a generated image"""
+    rng = random.Random(seed)
+    row_noise = bytes(rng.getrandbits(8) for _ in range(width * 3))
+    rows = b''.join(b'\x00' + row_noise[y % 7:] + row_noise[:y % 7] for y in range(height))
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(rows, 6)) + chunk(b'IEND', b'')
+
+def canned_blog(keyword, paragraphs=6):
+    """A completion shaped like the blogs BLOG_SYSTEM_PROMPT asks for"""
+    body = ' '.join(WORDS[:24])
+    sections = [f"# The Latest on {keyword}", "", "## Introduction", body]
+    for index in range(paragraphs):
+        sections += ["", f"## Section {index + 1}: {keyword} {WORDS[index]}", body, "", f"- {body[:60]}", f"- {body[60:120]}"]
+    sections += ["", "## Conclusion", body]
+    return '\n'.join(sections)
+
+# ---------------------------------------------------------------------------
+# Fakes
+# ---------------------------------------------------------------------------
+
+class FakeElement:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def send_keys(self, *keys):
+        self.driver.scroll()
+
+class FakeDriver:
+    """Enough of a Chrome WebDriver for search_latest_ai_news and extract_new_tweets.
+
+    Like the real timeline, only a window of tweets is rendered at a time and
+    each scroll renders page_size more. Every page also shows up as a
+    SearchTimeline response in the performance log, for the network capture mode.
+    """
+
+    def __init__(self, records, page_size=20, window=40, script_latency=0.0):
+        self.records = records
+        self.page_size = page_size
+        self.window = window
+        self.script_latency = script_latency
+        self.rendered = 0
+        # Status IDs of the articles EXTRACT_TWEETS_JS has tagged on the current page
+        self.extracted_ids = set()
+        self.current_url = "https://twitter.com/home"
+        self.script_calls = 0
+        self.performance_log = []
+        # Serialized up front, like the server's work, so it is not timed as extraction
+        self.response_bodies = {
+            str(page + 1): timeline_json(records[start:start + page_size])
+            for page, start in enumerate(range(0, len(records), page_size))
+        }
+        self.load_page()
+
+    def load_page(self):
+        start = self.rendered
+        self.rendered = min(self.rendered + self.page_size, len(self.records))
+        if self.rendered == start:
+            return
+        request_id = str(start // self.page_size + 1)
+        url = "https://twitter.com/i/api/graphql/abc123/SearchTimeline?variables=%7B%7D"
+        for message in (
+            {"method": "Network.responseReceived", "params": {"requestId": request_id, "response": {"url": url}}},
+            {"method": "Network.loadingFinished", "params": {"requestId": request_id}},
+        ):
+            self.performance_log.append({"message": json.dumps({"message": message}), "level": "INFO"})
+
+    def get(self, url):
+        self.current_url = url
+        self.rendered = 0
+        self.extracted_ids = set()
+        self.load_page()
+
+    def scroll(self):
+        self.load_page()
+
+    def get_log(self, log_type):
+        entries, self.performance_log = self.performance_log, []
+        return entries
+
+    def execute_cdp_cmd(self, command, params):
+        if command != "Network.getResponseBody":
+            raise ValueError(f"FakeDriver does not support {command}")
+        return {"body": self.response_bodies[params["requestId"]], "base64Encoded": False}
+
+    def visible_records(self):
+        return self.records[max(0, self.rendered - self.window):self.rendered]
+
+    def execute_script(self, script, *args):
+        self.script_calls += 1
+        if self.script_latency:
+            time.sleep(self.script_latency)
+        if script == stockmarket.EXTRACT_TWEETS_JS:
+            # Like the page, articles without a status ID are returned every time
+            fresh = [record for record in self.visible_records() if record.get("id") not in self.extracted_ids]
+            self.extracted_ids.update(record["id"] for record in fresh if record.get("id"))
+            return [dict(record) for record in fresh]
+        if script == stockmarket.PAGE_STATE_JS:
+            return [len(self.visible_records()), 400 * self.rendered, 0]
+        raise ValueError("FakeDriver only runs the scripts in stockmarket.py")
+
+    def find_element(self, by=None, value=None):
+        return FakeElement(self)
+
+    def find_elements(self, by=None, value=None):
+        # Matches both the first-result and the empty-state selectors
+        return [FakeElement(self)] if self.records else []
+
+    def quit(self):
+        pass
+
+class FakeCompletions:
+    def __init__(self, latency, tokens_per_second):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.calls = 0
+
+    def create(self, model, messages, temperature=0.7, max_tokens=4096, stream=False):
+        self.calls += 1
+        match = re.search(r"blog post about (.+?) based on", messages[-1]["content"])
+        keyword = match.group(1) if match else "the market"
+        content = canned_blog(keyword)
+        time.sleep(self.latency)
+        # Roughly four characters per token
+        tokens = [content[index:index + 4] for index in range(0, len(content), 4)]
+        if not stream:
+            time.sleep(len(tokens) / self.tokens_per_second)
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        return self.stream(tokens)
+
+    def stream(self, tokens):
+        delay = 1 / self.tokens_per_second
+        for token in tokens:
+            time.sleep(delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))], x_groq=None)
+        usage = SimpleNamespace(completion_tokens=len(tokens))
+        yield SimpleNamespace(choices=[], x_groq=SimpleNamespace(usage=usage))
+
+class FakeGroqClient:
+    """Stands in for groq.Client: chat.completions.create with and without stream=True"""
+
+    def __init__(self, latency=0.3, tokens_per_second=400.0):
+        self.chat = SimpleNamespace(completions=FakeCompletions(latency, tokens_per_second))
+
+def start_fake_image_server(latency=0.2, error_rate=0.0, image_size=768):
+    """Serve PNGs for POSTed prompts on a local port; returns (server, url)"""
+    image = make_png(image_size, image_size)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            time.sleep(latency)
+            if random.random() < error_rate:
+                body = json.dumps({"error": "Model is currently loading", "estimated_time": 0.05}).encode('utf-8')
+                self.send_response(503)
+                self.send_header('Content-Type', 'application/json')
+            else:
+                body = image
+                self.send_response(200)
+                self.send_header('Content-Type', 'image/png')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/models/benchmark"
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+def percentile(values, fraction):
+    """Linearly interpolated percentile of values (fraction between 0 and 1)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def stage_result(name, latencies, items, seconds, unit="items"):
+    return {
+        "stage": name,
+        "items": items,
+        "unit": unit,
+        "seconds": seconds,
+        "throughput": items / seconds if seconds else 0.0,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p90_ms": percentile(latencies, 0.9) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+@contextlib.contextmanager
+def quiet(enabled=True):
+    """Hide the pipeline's progress prints while timing"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+def run_timed(function, items, workers=1):
+    """Call function on every item (on workers threads); returns (results, latencies, seconds)"""
+    def timed(item):
+        start = time.perf_counter()
+        result = function(item)
+        return result, time.perf_counter() - start
+
+    start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(timed, items))
+    else:
+        outcomes = [timed(item) for item in items]
+    seconds = time.perf_counter() - start
+    return [result for result, _ in outcomes], [latency for _, latency in outcomes], seconds
+
+def bench_extraction(records, keywords, used_tweets, page_size, runs, capture_mode="dom"):
+    """Extraction runs over the fake timeline; scroll waits are reported separately"""
+    latencies = []
+    waits = []
+    tweets_by_keyword = {}
+    for _ in range(runs):
+        driver = FakeDriver(records, page_size=page_size)
+        stockmarket.search_latest_ai_news(driver, stockmarket.build_search_query(keywords))
+        wait_start = len(stockmarket.wait_timings)
+        start = time.perf_counter()
+        tweets_by_keyword = stockmarket.extract_new_tweets(driver, used_tweets, keywords, capture_mode=capture_mode)
+        elapsed = time.perf_counter() - start
+        waited = sum(timing["seconds"] for timing in stockmarket.wait_timings[wait_start:])
+        latencies.append(elapsed - waited)
+        waits.append(waited)
+    seconds = sum(latencies)
+    result = stage_result(f"extraction ({capture_mode})", latencies, len(records) * runs, seconds, "tweets")
+    result["scroll_wait_seconds"] = sum(waits) / runs
+    return result, tweets_by_keyword
+
+def bench_cleaning(records):
+    texts = [record["text"] for record in records]
+    _, latencies, seconds = run_timed(stockmarket.clean_tweet_text, texts)
+    return stage_result("cleaning", latencies, len(texts), seconds, "tweets")
+
+def bench_dedupe(records, db_filename):
+    """Exact and near-duplicate lookups against the used-tweet store, then adds"""
+    store = stockmarket.UsedTweetStore(db_filename)
+    cleaned = [stockmarket.clean_tweet_text(record["text"]) for record in records]
+    # Half of the history is already used, like a store after a few runs
+    for text in cleaned[::2]:
+        store.add(text)
+    store.commit()
+
+    def check(text):
+        if text in store:
+            return True
+        return store.find_near_duplicate(stockmarket.tweet_minhash(text)) is not None
+
+    _, latencies, seconds = run_timed(check, cleaned[1::2])
+    store.close()
+    return stage_result("dedupe", latencies, len(latencies), seconds, "tweets")
+
+def bench_generation(tweets_by_keyword, workers):
+    keywords = list(tweets_by_keyword)
+    contents, latencies, seconds = run_timed(
+        lambda keyword: stockmarket.generate_blog_content(keyword, tweets_by_keyword[keyword]), keywords, workers
+    )
+    blogs = [
+        {"keyword": keyword, "content": content, "tree": stockmarket.parse_blog(content), "images": []}
+        for keyword, content in zip(keywords, contents) if content
+    ]
+    result = stage_result("generation", latencies, len(keywords), seconds, "blogs")
+    if stockmarket.completion_stats:
+        result["time_to_first_token_p50_ms"] = percentile(
+            [stats["time_to_first_token"] for stats in stockmarket.completion_stats], 0.5
+        ) * 1000
+    return result, blogs
+
+def bench_images(blogs, image_generator, workers):
+    jobs = [
+        (blog, section, prompt)
+        for blog in blogs
+        for section, prompt in stockmarket.generate_image_prompts(blog["keyword"])
+    ]
+    paths, latencies, seconds = run_timed(lambda job: image_generator.generate_image(job[2]), jobs, workers)
+    for (blog, section, _), path in zip(jobs, paths):
+        if path:
+            blog["images"].append((section, path))
+    return stage_result("images", latencies, len(jobs), seconds, "images")
+
+def bench_docx(blogs, output_dir, workers):
+    """Per-document latency in this process, then the process pool end to end"""
+    _, latencies, seconds = run_timed(lambda blog: stockmarket.save_blog_to_word(blog, output_dir), blogs)
+    results = [stage_result("docx", latencies, len(blogs), seconds, "documents")]
+    if workers > 1 and len(blogs) > 1:
+        start = time.perf_counter()
+        stockmarket.save_blogs_to_word(blogs, workers=workers)
+        pool_seconds = time.perf_counter() - start
+        results.append(stage_result(f"docx x{workers} processes", [pool_seconds / len(blogs)] * len(blogs),
+                                    len(blogs), pool_seconds, "documents"))
+    return results
+
+def print_report(results):
+    print(f"\n{'stage':<24}{'items':>8}{'seconds':>10}{'per second':>14}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}")
+    for result in results:
+        print(
+            f"{result['stage']:<24}{result['items']:>8}{result['seconds']:>10.2f}"
+            f"{result['throughput']:>10.1f} {result['unit'][:3]:<3}"
+            f"{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        )
+    print()
+    for result in results:
+        if "scroll_wait_seconds" in result:
+            print(f"Scroll waits per {result['stage']} run (not in the table): {result['scroll_wait_seconds']:.2f}s")
+        if "time_to_first_token_p50_ms" in result:
+            print(f"Median time to first token: {result['time_to_first_token_p50_ms']:.1f} ms")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the blog pipeline offline")
+    parser.add_argument("--tweets", type=int, default=2000, help="synthetic tweets on the fake timeline")
+    parser.add_argument("--keywords", default="24",
+                        help="number of synthetic keywords, or a comma-separated list")
+    parser.add_argument("--html", nargs="*", default=[], help="recorded timeline HTML files to use instead")
+    parser.add_argument("--page-size", type=int, default=20, help="tweets rendered per scroll")
+    parser.add_argument("--extraction-runs", type=int, default=3)
+    parser.add_argument("--capture", choices=["dom", "network", "both"], default="both",
+                        help="read tweets from the rendered timeline, its JSON responses, or compare both")
+    parser.add_argument("--tweets-per-keyword", type=int, default=None,
+                        help="tweets collected per keyword (default: enough to read the whole timeline)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=400.0)
+    parser.add_argument("--stream", action="store_true", help="use streaming completions")
+    parser.add_argument("--image-latency", type=float, default=0.2, help="seconds per image request")
+    parser.add_argument("--image-error-rate", type=float, default=0.0, help="fraction of 503 model-loading replies")
+    parser.add_argument("--image-size", type=int, default=768)
+    parser.add_argument("--llm-concurrency", type=int, default=stockmarket.LLM_CONCURRENCY)
+    parser.add_argument("--image-concurrency", type=int, default=stockmarket.IMAGE_CONCURRENCY)
+    parser.add_argument("--docx-workers", type=int, default=stockmarket.DOCX_WORKERS)
+    parser.add_argument("--skip", nargs="*", default=[],
+                        choices=["extraction", "cleaning", "dedupe", "generation", "images", "docx"])
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--verbose", action="store_true", help="show the pipeline's own output")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+
+    if args.keywords.isdigit():
+        keywords = synthetic_keywords(int(args.keywords))
+    else:
+        keywords = [keyword.strip() for keyword in args.keywords.split(',') if keyword.strip()]
+
+    if args.html:
+        records = []
+        for filename in args.html:
+            with open(filename, encoding='utf-8') as f:
+                records.extend(parse_timeline_html(f.read()))
+        print(f"Loaded {len(records)} tweets from {len(args.html)} HTML file(s)")
+    else:
+        # Round-trip the synthetic timeline through HTML so the parser is exercised too
+        records = parse_timeline_html(timeline_html(synthetic_tweets(args.tweets, keywords, seed=args.seed)))
+        print(f"Generated {len(records)} synthetic tweets for {len(keywords)} keywords")
+
+    work_dir = tempfile.mkdtemp(prefix="stockmarket_bench_")
+    image_server = None
+    results = []
+    try:
+        # Everything the pipeline writes goes to the scratch directory, and no request leaves this machine
+        stockmarket.BLOG_DIR = os.path.join(work_dir, "blogs")
+        stockmarket.TWEETS_PER_KEYWORD = args.tweets_per_keyword or max(5, len(records))
+        stockmarket.LLM_STREAM = args.stream
+        stockmarket.client = FakeGroqClient(args.llm_latency, args.tokens_per_second)
+        stockmarket.completion_cache = stockmarket.CompletionCache(os.path.join(work_dir, "llm_cache.db"), mode='off')
+        stockmarket.ENDPOINT_SCHEDULERS["groq"] = stockmarket.EndpointScheduler("groq", 1e9, base_delay=0.01)
+        stockmarket.ENDPOINT_SCHEDULERS["huggingface"] = stockmarket.EndpointScheduler(
+            "huggingface", 1e9, base_delay=0.01
+        )
+
+        with quiet(not args.verbose):
+            used_tweets = stockmarket.UsedTweetStore(os.path.join(work_dir, "used_tweets.db"))
+            tweets_by_keyword = {keyword: [] for keyword in keywords}
+            if "extraction" not in args.skip:
+                for capture_mode in (["dom", "network"] if args.capture == "both" else [args.capture]):
+                    result, tweets_by_keyword = bench_extraction(
+                        records, keywords, used_tweets, args.page_size, args.extraction_runs, capture_mode
+                    )
+                    results.append(result)
+            used_tweets.close()
+
+            if "cleaning" not in args.skip:
+                results.append(bench_cleaning(records))
+            if "dedupe" not in args.skip:
+                results.append(bench_dedupe(records, os.path.join(work_dir, "dedupe.db")))
+
+            # Prompts carry at most TWEETS_PER_KEYWORD tweets in a real run
+            prompt_tweets = {keyword: tweets[:5] for keyword, tweets in tweets_by_keyword.items()}
+            blogs = [
+                {"keyword": keyword, "content": canned_blog(keyword), "images": []} for keyword in keywords
+            ]
+            if "generation" not in args.skip:
+                result, blogs = bench_generation(prompt_tweets, args.llm_concurrency)
+                results.append(result)
+            for blog in blogs:
+                blog.setdefault("tree", stockmarket.parse_blog(blog["content"]))
+
+            if "images" not in args.skip:
+                image_server, image_url = start_fake_image_server(
+                    args.image_latency, args.image_error_rate, args.image_size
+                )
+                os.environ.setdefault('HF_API_TOKEN', 'benchmark')
+                image_generator = stockmarket.HuggingFaceImageGenerator()
+                image_generator.api_url = image_url
+                image_generator.image_dir = os.path.join(work_dir, "generated_images")
+                image_generator.cache = stockmarket.ImageCache(image_generator.image_dir)
+                results.append(bench_images(blogs, image_generator, args.image_concurrency))
+
+            if "docx" not in args.skip:
+                os.makedirs(stockmarket.BLOG_DIR, exist_ok=True)
+                results.extend(bench_docx(blogs, stockmarket.BLOG_DIR, args.docx_workers))
+    finally:
+        if image_server:
+            image_server.shutdown()
+        # TRACE_FILE and METRICS_FILE work here as in a real run
+        stockmarket.write_metrics()
+
+    # Startup cost of a fresh interpreter, which every stockmarket.py command pays
+    import_ms = stockmarket.measure_import_time(3)
+    print_report(results)
+    print(f"Import time: {import_ms:.1f} ms (budget {stockmarket.IMPORT_TIME_BUDGET_MS:.0f} ms)")
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"arguments": vars(args), "import_ms": import_ms, "results": results}, f, indent=2)
+        print(f"\nResults written to {args.json}")
+    print(f"Benchmark files are in {work_dir}")
+    return results
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,43 +1,404 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
+# selenium, python-docx, requests and groq are imported inside the functions
+# that use them, so commands that do not scrape or render start quickly
 import os
+import sys
 import time
-import pandas as pd
-from docx import Document
-from docx.shared import Inches
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 import subprocess
+import argparse
 import re
 import glob
-import requests
+import csv
+import hashlib
+import array
+import sqlite3
+import functools
+import io
+import json
+import random
+import queue
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 import base64
+import html
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
 from dotenv import load_dotenv # type: ignore
-from groq import Client # type: ignore
 
 # Load environment variables
 load_dotenv()
 
-# Configure Groq client
-client = Client(api_key=os.getenv('GROQ_API_KEY'))
+# Groq client, created on first use by get_client (tests and the benchmark may assign their own)
+client = None
+client_lock = threading.Lock()
+
+def get_client():
+    """Return the Groq client, creating it on first use"""
+    global client
+    with client_lock:
+        if client is None:
+            from groq import Client # type: ignore
+            # Retries are handled by the shared endpoint scheduler
+            client = Client(api_key=os.getenv('GROQ_API_KEY'), max_retries=0)
+        return client
+
+# Longest acceptable "import stockmarket" in a fresh interpreter, checked by the import-time command
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', 250))
 
 # Path to your chromedriver
 PATH = "C:/Users/ajays/Documents/chromedriver-win64/chromedriver.exe"
 
+# Saved Twitter login cookies, and an optional Chrome profile that keeps the login itself
+TWITTER_SESSION_FILE = 'twitter_session.json'
+CHROME_PROFILE_DIR = os.getenv('CHROME_PROFILE_DIR')
+
 # Define the blog directory path
 BLOG_DIR = r"C:\Users\ajays\Desktop\CapX\twitter content generation"
 
+# History of tweets already used for blogs
+USED_TWEETS_CSV = 'used_tweets.csv'
+USED_TWEETS_DB = 'used_tweets.db'
+
+# Which inputs produced each saved blog, so unchanged keywords are not regenerated
+BLOG_MANIFEST_FILE = os.path.join(BLOG_DIR, 'blog_manifest.json')
+
+# Tweets whose estimated Jaccard similarity over words and word pairs is at
+# least this much count as near-duplicates
+NEAR_DUPLICATE_MIN_SIMILARITY = float(os.getenv('NEAR_DUPLICATE_MIN_SIMILARITY', 0.5))
+
+# MinHash signatures are MINHASH_BANDS bands of MINHASH_ROWS values. Two tweets
+# with similarity s share a band with probability 1 - (1 - s**ROWS)**BANDS:
+# 87% at s = 0.5, 99% at 0.6 and over 99.9% from 0.7, independent of how many
+# tweets are stored. Candidates below the threshold are filtered out afterwards.
+MINHASH_BANDS = 32
+MINHASH_ROWS = 4
+
+# Upper bounds on parallel Groq completions and Hugging Face image requests
+LLM_CONCURRENCY = int(os.getenv('LLM_CONCURRENCY', 4))
+IMAGE_CONCURRENCY = int(os.getenv('IMAGE_CONCURRENCY', 2))
+
+# Size cap of the on-disk cache of generated images, reused across runs
+IMAGE_CACHE_MAX_MB = int(os.getenv('IMAGE_CACHE_MAX_MB', 500))
+
+# Groq model and system prompt used for every blog
+BLOG_MODEL = "mixtral-8x7b-32768"
+# Bump when build_blog_messages or generate_image_prompts change, so existing blogs are regenerated
+BLOG_PROMPT_VERSION = 1
+BLOG_SYSTEM_PROMPT = (
+    "You are an expert technology analyst and writer specializing in AI and emerging technologies. "
+    "You excel at creating comprehensive, well-researched blog posts that blend technical depth with "
+    "accessibility. Your writing is known for being data-driven, insightful, and engaging while maintaining "
+    "professional standards and technical accuracy."
+)
+
+# Stream completions so sections (and their images) can start before the whole blog is written
+LLM_STREAM = os.getenv('LLM_STREAM', '0') == '1'
+
+# Completion cache: "on", "off" or "replay" (serve cached completions only, never call Groq)
+LLM_CACHE_MODE = os.getenv('LLM_CACHE_MODE', 'on')
+LLM_CACHE_DB = 'llm_cache.db'
+LLM_CACHE_TTL_HOURS = float(os.getenv('LLM_CACHE_TTL_HOURS', 24))
+LLM_CACHE_MAX_MB = int(os.getenv('LLM_CACHE_MAX_MB', 50))
+
+# Client-side request budgets shared by every call to an endpoint
+GROQ_REQUESTS_PER_MINUTE = float(os.getenv('GROQ_REQUESTS_PER_MINUTE', 30))
+HF_REQUESTS_PER_MINUTE = float(os.getenv('HF_REQUESTS_PER_MINUTE', 20))
+
+# Ceilings in seconds for waits on page conditions, and how often they are polled
+WAIT_CEILINGS = {
+    "password_field": float(os.getenv('WAIT_PASSWORD_FIELD', 25)),
+    "home_page": float(os.getenv('WAIT_HOME_PAGE', 15)),
+    "search_results": float(os.getenv('WAIT_SEARCH_RESULTS', 10)),
+    "scroll": float(os.getenv('WAIT_SCROLL', 5)),
+    "session_check": float(os.getenv('WAIT_SESSION_CHECK', 10)),
+}
+WAIT_POLL_INTERVAL = 0.25
+
+# A scroll that triggers no network requests for this long has nothing more to load
+NETWORK_IDLE_SECONDS = 0.75
+
+# Headless Chrome workers searching one keyword each; 0 runs one combined search instead
+SCRAPE_WORKERS = int(os.getenv('SCRAPE_WORKERS', 0))
+
+# Overlap scraping, blog text, images and docx writing instead of running them one after another
+STREAMING_PIPELINE = os.getenv('STREAMING_PIPELINE', '0') == '1'
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', 4))
+
+# Connect and read timeouts in seconds for remote image requests
+IMAGE_REQUEST_TIMEOUT = (10, 300)
+
+# Image backend: "remote" (Hugging Face inference API) or "local" (diffusers in this process)
+IMAGE_BACKEND = os.getenv('IMAGE_BACKEND', 'remote')
+IMAGE_NEGATIVE_PROMPT = "blurry, bad quality, distorted, ugly, bad art, poor details"
+
+# Local backend defaults suit CPU-only machines: a distilled model, few steps, small images
+LOCAL_IMAGE_MODEL = os.getenv('LOCAL_IMAGE_MODEL', 'stabilityai/sd-turbo')
+LOCAL_IMAGE_STEPS = int(os.getenv('LOCAL_IMAGE_STEPS', 2))
+LOCAL_IMAGE_SIZE = int(os.getenv('LOCAL_IMAGE_SIZE', 512))
+LOCAL_IMAGE_GUIDANCE = float(os.getenv('LOCAL_IMAGE_GUIDANCE', 0.0))
+
+# Images are embedded at DOCX_IMAGE_WIDTH_INCHES, so anything above this many pixels per inch is wasted
+DOCX_IMAGE_WIDTH_INCHES = 4
+DOCX_IMAGE_DPI = int(os.getenv('DOCX_IMAGE_DPI', 150))
+DOCX_IMAGE_QUALITY = int(os.getenv('DOCX_IMAGE_QUALITY', 82))
+# Size cap of the downscaled copies kept next to the generated images
+DOCX_IMAGE_CACHE_MAX_MB = int(os.getenv('DOCX_IMAGE_CACHE_MAX_MB', 100))
+
+# Keyword sets and schedules for daemon mode, and the interval used when a set has no schedule
+DAEMON_CONFIG = os.getenv('DAEMON_CONFIG', 'daemon.json')
+DAEMON_INTERVAL_MINUTES = float(os.getenv('DAEMON_INTERVAL_MINUTES', 60))
+
+# Processes building and saving Word documents in parallel (1 writes them in this process)
+DOCX_WORKERS = int(os.getenv('DOCX_WORKERS', 2))
+
+# Timing spans are appended to TRACE_FILE as JSON lines and counters written to METRICS_FILE
+# in Prometheus text format; with neither set, instrumentation does nothing
+TRACE_FILE = os.getenv('TRACE_FILE')
+METRICS_FILE = os.getenv('METRICS_FILE')
+
+# Number of tweets collected for each keyword
+TWEETS_PER_KEYWORD = 5
+
+# How tweets are read: "dom" queries the rendered timeline, "network" parses the
+# timeline's JSON responses from Chrome's performance log
+CAPTURE_MODE = os.getenv('CAPTURE_MODE', 'dom')
+
+# GraphQL endpoint whose responses carry the search results (the home timelines
+# load alongside it but are not part of the search)
+TIMELINE_RESPONSE_PATTERN = re.compile(r'/graphql/[^/]+/SearchTimeline\b')
+
+# URLs, mentions, hashtags and every non-letter character, removed in one pass.
+# Mentions and hashtags stop before an embedded URL so the result matches
+# stripping URLs first.
+TWEET_NOISE_PATTERN = re.compile(r'http\S+|@(?:(?!http\S)\w)+|#(?:(?!http\S)\w)+|[^a-zA-Z\s]')
+
+# Same as above but keeps letters from every script (non-ASCII tickers and names)
+TWEET_NOISE_PATTERN_UNICODE = re.compile(r'http\S+|@(?:(?!http\S)\w)+|#(?:(?!http\S)\w)+|[^\w\s]|[\d_]')
+
+# Timeline article count, page height and number of network requests made so far
+PAGE_STATE_JS = """
+performance.setResourceTimingBufferSize(100000);
+return [
+    document.querySelectorAll("article[data-testid='tweet']").length,
+    document.documentElement.scrollHeight,
+    performance.getEntriesByType("resource").length
+];
+"""
+
+# Pulls text, status ID, author and timestamp for every newly rendered tweet at once.
+# Each article is tagged with the status ID it was read for, so later calls skip it
+# without reading its text; the timeline reuses articles, hence the ID and not a flag.
+EXTRACT_TWEETS_JS = """
+const records = [];
+for (const article of document.querySelectorAll("article[data-testid='tweet']")) {
+    const textNode = article.querySelector("div[data-testid='tweetText']");
+    if (!textNode) {
+        continue;
+    }
+    const timeNode = article.querySelector("time");
+    const link = (timeNode && timeNode.closest("a[href*='/status/']"))
+        || article.querySelector("a[href*='/status/']");
+    const match = link ? link.getAttribute("href").match(/\\/([^\\/]+)\\/status\\/(\\d+)/) : null;
+    const key = match ? match[2] : "";
+    if (key && article.dataset.extractedId === key) {
+        continue;
+    }
+    article.dataset.extractedId = key;
+    records.push({
+        text: textNode.innerText,
+        id: match ? match[2] : null,
+        author: match ? match[1] : null,
+        timestamp: timeNode ? timeNode.getAttribute("datetime") : null
+    });
+}
+return records;
+"""
+
 def ensure_blog_directory():
     """Create the blog directory if it doesn't exist"""
     if not os.path.exists(BLOG_DIR):
         os.makedirs(BLOG_DIR)
         print(f"Created blog directory at: {BLOG_DIR}")
 
+# Counter values and span duration totals, keyed by (name, sorted labels)
+metric_counters = {}
+metric_durations = {}
+metrics_lock = threading.Lock()
+trace_lock = threading.Lock()
+trace_output = None
+span_context = threading.local()
+
+class NoopSpan:
+    """Returned by span() when tracing is off so instrumented code costs almost nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+NOOP_SPAN = NoopSpan()
+
+class Span:
+    """Times a block and records it in the trace file and the span metrics"""
+
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.span_id = uuid.uuid4().hex[:16]
+
+    def __enter__(self):
+        stack = span_context.__dict__.setdefault('stack', [])
+        self.parent_id = stack[-1].span_id if stack else None
+        stack.append(self)
+        self.start = time.time()
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        duration = time.perf_counter() - self.started
+        span_context.stack.pop()
+        with metrics_lock:
+            span_count, total = metric_durations.get(self.name, (0, 0.0))
+            metric_durations[self.name] = (span_count + 1, total + duration)
+        if TRACE_FILE:
+            event = {
+                "name": self.name,
+                "span_id": self.span_id,
+                "parent_id": self.parent_id,
+                "start": round(self.start, 6),
+                "duration": round(duration, 6),
+                "thread": threading.current_thread().name,
+                "pid": os.getpid(),
+                "attrs": self.attrs,
+            }
+            if exc_type:
+                event["error"] = f"{exc_type.__name__}: {exc}"
+            write_trace_event(event)
+        return False
+
+    def set(self, **attrs):
+        """Attach attributes known only once the block has run"""
+        self.attrs.update(attrs)
+
+def span(name, **attrs):
+    """Context manager timing one stage; use span.set(...) to add results"""
+    if not (TRACE_FILE or METRICS_FILE):
+        return NOOP_SPAN
+    return Span(name, attrs)
+
+def count(name, value=1, **labels):
+    """Add value to the counter name with the given labels"""
+    if not (TRACE_FILE or METRICS_FILE):
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with metrics_lock:
+        metric_counters[key] = metric_counters.get(key, 0) + value
+
+def merge_metrics(counters, durations):
+    """Add counters and span durations recorded in another process"""
+    with metrics_lock:
+        for key, value in counters.items():
+            metric_counters[key] = metric_counters.get(key, 0) + value
+        for name, (span_count, total) in durations.items():
+            previous_count, previous_total = metric_durations.get(name, (0, 0.0))
+            metric_durations[name] = (previous_count + span_count, previous_total + total)
+
+def write_trace_event(event):
+    global trace_output
+    line = json.dumps(event, default=str) + '\n'
+    with trace_lock:
+        if trace_output is None:
+            trace_output = open(TRACE_FILE, 'a', encoding='utf-8')
+        trace_output.write(line)
+        trace_output.flush()
+
+def format_metric_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+def write_metrics(filename=None):
+    """Write a Prometheus text-format snapshot of the counters and span durations"""
+    filename = filename or METRICS_FILE
+    if not filename:
+        return
+    with metrics_lock:
+        counters = sorted(metric_counters.items())
+        durations = sorted(metric_durations.items())
+    lines = []
+    declared = set()
+    for (name, labels), value in counters:
+        metric = f"stockmarket_{name}_total"
+        if metric not in declared:
+            lines.append(f"# TYPE {metric} counter")
+            declared.add(metric)
+        lines.append(f"{metric}{format_metric_labels(labels)} {value}")
+    if durations:
+        lines.append("# TYPE stockmarket_span_seconds summary")
+        for name, (span_count, total) in durations:
+            labels = format_metric_labels((("span", name),))
+            lines.append(f"stockmarket_span_seconds_count{labels} {span_count}")
+            lines.append(f"stockmarket_span_seconds_sum{labels} {total:.6f}")
+    temp_filename = f"{filename}.tmp"
+    with open(temp_filename, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(temp_filename, filename)
+
+# Timing of every condition wait: label, seconds waited and the outcome
+wait_timings = []
+
+def wait_for_condition(driver, condition, label, timeout=None, required=False):
+    """Poll condition until it returns a truthy value or the ceiling for label passes"""
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = WAIT_CEILINGS.get(label, 10) if timeout is None else timeout
+    start = time.monotonic()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+    except TimeoutException:
+        result = None
+    wait_timings.append({
+        "label": label,
+        "seconds": round(time.monotonic() - start, 3),
+        "outcome": result if isinstance(result, str) else ("met" if result is not None else "timeout"),
+    })
+    if result is None and required:
+        raise TimeoutException(f"Timed out after {timeout} seconds waiting for {label}")
+    return result
+
+class TimelineChanged:
+    """Wait condition: new tweets rendered, the page grew, or the network went quiet"""
+
+    def __init__(self, before, idle_seconds=NETWORK_IDLE_SECONDS):
+        self.articles, self.height, self.resources = before
+        self.idle_seconds = idle_seconds
+        self.last_activity = time.monotonic()
+
+    def __call__(self, driver):
+        articles, height, resources = driver.execute_script(PAGE_STATE_JS)
+        if articles > self.articles or height != self.height:
+            return "changed"
+        now = time.monotonic()
+        if resources != self.resources:
+            self.resources = resources
+            self.last_activity = now
+        elif now - self.last_activity >= self.idle_seconds:
+            return "idle"
+        return False
+
 def login_to_twitter(driver, username, password):
     """Log in to Twitter using provided credentials"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
     driver.get("https://twitter.com/login")
     username_field = WebDriverWait(driver, 10).until(
         EC.presence_of_element_located((By.XPATH, "//input[@name='text']"))
@@ -49,10 +410,9 @@ def login_to_twitter(driver, username, password):
     )
     next_button.click()
 
-    time.sleep(15)
-
-    password_field = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.XPATH, "//input[@name='password']"))
+    password_field = wait_for_condition(
+        driver, EC.presence_of_element_located((By.XPATH, "//input[@name='password']")),
+        "password_field", required=True
     )
     password_field.send_keys(password)
 
@@ -61,72 +421,599 @@ def login_to_twitter(driver, username, password):
     )
     log_in.click()
 
-    WebDriverWait(driver, 15).until(EC.url_contains("home"))
+    wait_for_condition(driver, EC.url_contains("home"), "home_page", required=True)
+
+def create_driver(headless=False, profile_dir=CHROME_PROFILE_DIR, capture_mode=None):
+    """Start Chrome, keeping its profile in profile_dir when set"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    options = webdriver.ChromeOptions()
+    if (capture_mode or CAPTURE_MODE) == "network":
+        # Network events (and through them the response bodies) are only available with performance logging
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1280,2000")
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={os.path.abspath(profile_dir)}")
+    return webdriver.Chrome(service=Service(PATH), options=options)
+
+def save_twitter_session(driver, session_file=TWITTER_SESSION_FILE):
+    """Save the authenticated cookies so the next run can skip the login flow"""
+    try:
+        parts = urlsplit(driver.current_url)
+        session = {"url": f"{parts.scheme}://{parts.netloc}", "cookies": driver.get_cookies(), "saved": time.time()}
+        temp_file = f"{session_file}.tmp"
+        with open(temp_file, 'w') as f:
+            json.dump(session, f)
+        os.replace(temp_file, session_file)
+    except Exception as e:
+        print(f"Error saving Twitter session: {e}")
+
+def restore_twitter_session(driver, session_file=TWITTER_SESSION_FILE):
+    """Load saved cookies into the browser; returns False if there is nothing to load"""
+    try:
+        with open(session_file) as f:
+            session = json.load(f)
+    except FileNotFoundError:
+        return False
+    except Exception as e:
+        print(f"Error reading Twitter session: {e}")
+        return False
+
+    # Cookies can only be set for the site currently open, so load a cheap page there first
+    driver.get(f"{session['url']}/robots.txt")
+    for cookie in session.get("cookies", []):
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            print(f"Skipping cookie {cookie.get('name')}: {e}")
+    return True
+
+def check_home_timeline(driver):
+    """Wait condition telling a signed-in home page apart from a login redirect"""
+    from selenium.webdriver.common.by import By
+
+    if driver.find_elements(By.CSS_SELECTOR, "[data-testid='SideNav_AccountSwitcher_Button']"):
+        return "logged_in"
+    if "/login" in driver.current_url or "/i/flow/" in driver.current_url:
+        return "logged_out"
+    return False
+
+def is_logged_in(driver):
+    """Check whether the browser already has a valid Twitter session"""
+    driver.get("https://twitter.com/home")
+    return wait_for_condition(driver, check_home_timeline, "session_check") == "logged_in"
+
+def ensure_logged_in(driver, username, password, session_file=TWITTER_SESSION_FILE, profile_dir=CHROME_PROFILE_DIR):
+    """Reuse a saved session when it is still valid, otherwise log in again.
+
+    profile_dir is the profile the driver was started with; a driver without
+    one gets the cookies from session_file.
+    """
+    with span("login") as login_span:
+        if (profile_dir or restore_twitter_session(driver, session_file)) and is_logged_in(driver):
+            print("Reusing saved Twitter session")
+            login_span.set(reused=True)
+        else:
+            login_to_twitter(driver, username, password)
+            login_span.set(reused=False)
+        save_twitter_session(driver, session_file)
 
 def search_latest_ai_news(driver, search_url):
     """Search for AI-related tweets"""
-    driver.get(search_url)
-    time.sleep(5)
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+
+    with span("search", url=search_url):
+        driver.get(search_url)
+        # Either the first tweet or Twitter's "no results" placeholder ends the wait
+        wait_for_condition(
+            driver,
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "article[data-testid='tweet'], div[data-testid='emptyState']")
+            ),
+            "search_results"
+        )
 
 def scroll_and_load_tweets(driver):
     """Scroll to load more tweets"""
-    try:
-        driver.find_element(By.TAG_NAME, "body").send_keys(Keys.PAGE_DOWN)
-        time.sleep(2)
-    except Exception as e:
-        print(f"Error during scroll: {e}")
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+
+    with span("scroll") as scroll_span:
+        try:
+            before = driver.execute_script(PAGE_STATE_JS)
+            driver.find_element(By.TAG_NAME, "body").send_keys(Keys.PAGE_DOWN)
+            scroll_span.set(outcome=wait_for_condition(driver, TimelineChanged(before), "scroll") or "timeout")
+        except Exception as e:
+            print(f"Error during scroll: {e}")
+
+def summarize_wait_timings(since=0):
+    """Total seconds waited and number of waits per label, from wait number since on"""
+    summary = {}
+    for timing in wait_timings[since:]:
+        total, waits = summary.get(timing["label"], (0.0, 0))
+        summary[timing["label"]] = (total + timing["seconds"], waits + 1)
+    return summary
+
+class KeywordMatcher:
+    """Find every keyword contained in a text in a single pass (Aho-Corasick automaton)"""
+
+    def __init__(self, keywords, case_sensitive=False, word_boundary=False):
+        self.keywords = list(keywords)
+        self.case_sensitive = case_sensitive
+        self.word_boundary = word_boundary
+
+        # Trie of all keywords; outputs holds (keyword index, length) ending at each node
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        for index, keyword in enumerate(self.keywords):
+            pattern = self._normalize(keyword)
+            if not pattern:
+                continue
+            node = 0
+            for char in pattern:
+                child = self.goto[node].get(char)
+                if child is None:
+                    child = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.goto[node][char] = child
+                node = child
+            self.outputs[node].append((index, len(pattern)))
+
+        # Breadth-first pass links every node to its longest proper suffix in the trie
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+                queue.append(child)
+
+    def _normalize(self, text):
+        return text if self.case_sensitive else text.casefold()
+
+    @staticmethod
+    def _is_word_char(char):
+        return char.isalnum() or char == '_'
+
+    def _at_word_boundary(self, text, start, end):
+        """Check that the match text[start:end] is not part of a longer word"""
+        if start > 0 and self._is_word_char(text[start - 1]) and self._is_word_char(text[start]):
+            return False
+        if end < len(text) and self._is_word_char(text[end]) and self._is_word_char(text[end - 1]):
+            return False
+        return True
+
+    def find_all(self, text):
+        """Return every keyword found in text, in the order the keywords were given"""
+        text = self._normalize(text)
+        found = set()
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            for index, length in self.outputs[node]:
+                if index in found:
+                    continue
+                if self.word_boundary and not self._at_word_boundary(text, position - length + 1, position + 1):
+                    continue
+                found.add(index)
+        return [self.keywords[index] for index in sorted(found)]
+
+    def matches(self, text):
+        """Check if text contains any keyword"""
+        return bool(self.find_all(text))
+
+@functools.lru_cache(maxsize=128)
+def get_keyword_matcher(keywords, case_sensitive=False, word_boundary=False):
+    """Build (or reuse) a matcher for a tuple of keywords"""
+    return KeywordMatcher(keywords, case_sensitive=case_sensitive, word_boundary=word_boundary)
 
 def is_tweet_relevant(tweet, keywords):
     """Check if tweet contains relevant keywords"""
-    return any(keyword.lower() in tweet.lower() for keyword in keywords)
+    return get_keyword_matcher(tuple(keywords)).matches(tweet)
 
-def clean_tweet_text(text):
+def clean_tweet_text(text, unicode=False):
     """Clean tweet text by removing URLs, mentions, hashtags, etc."""
-    text = re.sub(r'http\S+', '', text)
-    text = re.sub(r'@\w+', '', text)
-    text = re.sub(r'#\w+', '', text)
-    text = re.sub(r'[^a-zA-Z\s]', '', text)
-    text = ' '.join(text.split())
-    return text
-
-def extract_new_tweets(driver, used_tweets, keywords):
-    """Extract new relevant tweets, up to 5 per keyword"""
+    pattern = TWEET_NOISE_PATTERN_UNICODE if unicode else TWEET_NOISE_PATTERN
+    return ' '.join(pattern.sub('', text).split())
+
+def clean_tweets(texts, unicode=False):
+    """Clean a batch of tweets lazily, one cleaned string per input"""
+    pattern = TWEET_NOISE_PATTERN_UNICODE if unicode else TWEET_NOISE_PATTERN
+    sub = pattern.sub
+    for text in texts:
+        yield ' '.join(sub('', text).split())
+
+def clean_tweet_series(series, unicode=False):
+    """Clean a pandas Series of tweets supplied by the caller; this module never imports pandas itself"""
+    pattern = TWEET_NOISE_PATTERN_UNICODE if unicode else TWEET_NOISE_PATTERN
+    return series.fillna('').astype(str).str.replace(pattern, '', regex=True).str.split().str.join(' ')
+
+def tweet_minhash(text):
+    """MinHash signature of a cleaned tweet over its words and word pairs, or None if it is empty"""
+    words = text.lower().split()
+    features = set(words)
+    features.update(f"{first} {second}" for first, second in zip(words, words[1:]))
+    if not features:
+        return None
+    # One SHAKE digest per feature supplies an independent 32-bit hash for every signature value
+    size = 4 * MINHASH_BANDS * MINHASH_ROWS
+    rows = [array.array('I', hashlib.shake_128(feature.encode('utf-8')).digest(size)) for feature in features]
+    return array.array('I', map(min, zip(*rows)))
+
+def minhash_similarity(first, second):
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    return sum(a == b for a, b in zip(first, second)) / len(first)
+
+def minhash_bands(signature):
+    """Hash each band of a MinHash signature to a signed 64-bit value (fits an SQLite integer)"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(signature[start:start + MINHASH_ROWS].tobytes(), digest_size=8).digest(),
+            'big', signed=True
+        )
+        for start in range(0, MINHASH_BANDS * MINHASH_ROWS, MINHASH_ROWS)
+    ]
+
+class MinHashIndex:
+    """In-memory LSH index of MinHash signatures for near-duplicate lookups"""
+
+    def __init__(self, min_similarity=NEAR_DUPLICATE_MIN_SIMILARITY):
+        self.min_similarity = min_similarity
+        self.buckets = [{} for _ in range(MINHASH_BANDS)]
+
+    def add(self, signature):
+        for band, value in enumerate(minhash_bands(signature)):
+            self.buckets[band].setdefault(value, []).append(signature)
+
+    def find_near(self, signature):
+        """Return a stored signature at least min_similarity similar, or None"""
+        for band, value in enumerate(minhash_bands(signature)):
+            for candidate in self.buckets[band].get(value, ()):
+                if minhash_similarity(candidate, signature) >= self.min_similarity:
+                    return candidate
+        return None
+
+def fetch_visible_tweets(driver):
+    """Collect every rendered tweet in a single WebDriver round trip"""
+    try:
+        return driver.execute_script(EXTRACT_TWEETS_JS) or []
+    except Exception as e:
+        print(f"Error extracting tweets: {e}")
+        return []
+
+class TweetCursor:
+    """Remember which tweets have already been processed, keyed by status ID"""
+
+    def __init__(self):
+        self.seen_ids = set()
+
+    def new_records(self, records):
+        """Return only the records that were not handed out before"""
+        fresh = []
+        for record in records:
+            # Tweets without a permalink fall back to their text as the key
+            key = record.get("id") or record.get("text")
+            if not key or key in self.seen_ids:
+                continue
+            self.seen_ids.add(key)
+            fresh.append(record)
+        return fresh
+
+def timeline_created_at(value):
+    """Convert the API's "Wed Oct 10 20:19:24 +0000 2018" to the DOM's ISO timestamp"""
+    try:
+        return time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.strptime(value, '%a %b %d %H:%M:%S +0000 %Y'))
+    except (TypeError, ValueError):
+        return value
+
+def timeline_tweet_record(result):
+    """Turn a tweet_results result into the record shape EXTRACT_TWEETS_JS returns, or None"""
+    if result.get("__typename") == "TweetWithVisibilityResults":
+        result = result.get("tweet") or {}
+    legacy = result.get("legacy")
+    if not isinstance(legacy, dict):
+        return None
+
+    # A retweet's own text is a truncated "RT @author: ..."; like the DOM, use the original tweet
+    retweeted = (legacy.get("retweeted_status_result") or {}).get("result")
+    if isinstance(retweeted, dict):
+        return timeline_tweet_record(retweeted)
+
+    # Long tweets are truncated in full_text; the note tweet holds the whole text
+    note = ((result.get("note_tweet") or {}).get("note_tweet_results") or {}).get("result") or {}
+    text = note.get("text") or legacy.get("full_text") or legacy.get("text")
+    if not text:
+        return None
+
+    user = ((result.get("core") or {}).get("user_results") or {}).get("result") or {}
+    author = (user.get("legacy") or {}).get("screen_name") or (user.get("core") or {}).get("screen_name")
+    views = (result.get("views") or {}).get("count")
+    return {
+        "text": html.unescape(text),
+        "id": legacy.get("id_str") or result.get("rest_id"),
+        "author": author,
+        "timestamp": timeline_created_at(legacy.get("created_at")),
+        "likes": legacy.get("favorite_count"),
+        "retweets": legacy.get("retweet_count"),
+        "replies": legacy.get("reply_count"),
+        "quotes": legacy.get("quote_count"),
+        "views": int(views) if views and str(views).isdigit() else None,
+    }
+
+# Keys holding {"result": tweet} in timeline responses: timeline entries, quoted tweets
+# and retweeted tweets (reached through the retweet as well, and deduplicated by ID)
+TIMELINE_RESULT_KEYS = ("tweet_results", "quoted_status_result", "retweeted_status_result")
+
+def parse_timeline_json(payload):
+    """Every tweet in a timeline GraphQL response, in timeline order.
+
+    Walks the whole payload for tweet results, so layout changes between
+    instructions and modules are handled alike. A retweet yields the original
+    tweet, and a quoted tweet is returned after the tweet quoting it.
+    """
+    if isinstance(payload, (str, bytes)):
+        payload = json.loads(payload)
+    records = []
+    seen_ids = set()
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key in TIMELINE_RESULT_KEYS:
+                tweet_results = node.get(key)
+                if isinstance(tweet_results, dict) and isinstance(tweet_results.get("result"), dict):
+                    record = timeline_tweet_record(tweet_results["result"])
+                    if record and record["id"] not in seen_ids:
+                        seen_ids.add(record["id"])
+                        records.append(record)
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return records
+
+class NetworkTweetCapture:
+    """Read timeline tweets from Chrome's performance log instead of the DOM.
+
+    Each call to fetch returns the tweets from timeline responses that finished
+    loading since the previous call.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pending = set()
+
+    def fetch(self):
+        """Records from newly loaded timeline responses, or None if the log is unavailable"""
+        try:
+            entries = self.driver.get_log("performance")
+        except Exception as e:
+            print(f"Error reading the performance log, using the DOM instead: {e}")
+            return None
+
+        finished = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            params = message.get("params") or {}
+            if message.get("method") == "Network.responseReceived":
+                if TIMELINE_RESPONSE_PATTERN.search((params.get("response") or {}).get("url", "")):
+                    self.pending.add(params.get("requestId"))
+            elif message.get("method") == "Network.loadingFinished" and params.get("requestId") in self.pending:
+                self.pending.discard(params["requestId"])
+                finished.append(params["requestId"])
+
+        records = []
+        for request_id in finished:
+            try:
+                response = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+                body = response.get("body", "")
+                if response.get("base64Encoded"):
+                    body = base64.b64decode(body)
+                records.extend(parse_timeline_json(body))
+            except Exception as e:
+                print(f"Error reading timeline response {request_id}: {e}")
+        count("timeline_responses", len(finished))
+        return records
+
+def extract_new_tweets(driver, used_tweets, keywords, batch=True, cursor=None, max_idle_scrolls=2, matcher=None,
+                       min_similarity=NEAR_DUPLICATE_MIN_SIMILARITY, on_keyword_complete=None, capture_mode=None):
+    """Extract new relevant tweets, up to 5 per keyword.
+
+    on_keyword_complete(keyword, tweets) is called as soon as a keyword has all
+    its tweets, and for the remaining keywords once extraction stops.
+    capture_mode "network" reads tweets from timeline responses (see
+    NetworkTweetCapture); the default comes from CAPTURE_MODE.
+    """
+    matcher = matcher or KeywordMatcher(keywords)
+    if not batch:
+        tweets_by_keyword = extract_new_tweets_per_element(driver, used_tweets, keywords, matcher)
+        if on_keyword_complete:
+            for keyword, tweets in tweets_by_keyword.items():
+                on_keyword_complete(keyword, tweets)
+        return tweets_by_keyword
+
+    tweets_by_keyword = {keyword: [] for keyword in keywords}
+    completed = set()
+
+    # Near-duplicates of collected or already used tweets are skipped (None disables)
+    collected = MinHashIndex(min_similarity) if min_similarity is not None else None
+    find_used_near_duplicate = getattr(used_tweets, 'find_near_duplicate', None)
+    cursor = cursor or TweetCursor()
+    network = NetworkTweetCapture(driver) if (capture_mode or CAPTURE_MODE) == "network" else None
+    max_attempts = 10 * len(keywords)  # Same scroll budget as the per-keyword loop
+    idle_scrolls = 0
+
+    while max_attempts > 0:
+        fetched = network.fetch() if network else None
+        if fetched is None:
+            network = None
+            fetched = fetch_visible_tweets(driver)
+        records = cursor.new_records(fetched)
+        if records:
+            idle_scrolls = 0
+        else:
+            idle_scrolls += 1
+            if idle_scrolls > max_idle_scrolls:
+                print("No new tweets after scrolling, stopping early")
+                break
+
+        # One pass over the new tweets sorts each into every keyword it matches
+        for record in records:
+            tweet_text = record.get("text") or ""
+            matched_keywords = matcher.find_all(tweet_text)
+            if not matched_keywords:
+                continue
+
+            # The history stores cleaned text, so compare against that
+            clean_text = clean_tweet_text(tweet_text)
+            if not clean_text or clean_text in used_tweets:
+                continue
+
+            if collected is not None:
+                signature = tweet_minhash(clean_text)
+                if collected.find_near(signature) is not None:
+                    continue
+                if find_used_near_duplicate and find_used_near_duplicate(signature, min_similarity) is not None:
+                    continue
+                collected.add(signature)
+
+            for keyword in matched_keywords:
+                keyword_tweets = tweets_by_keyword[keyword]
+                if len(keyword_tweets) >= TWEETS_PER_KEYWORD:
+                    continue
+                if clean_text not in keyword_tweets:
+                    keyword_tweets.append(clean_text)
+                    if on_keyword_complete and len(keyword_tweets) >= TWEETS_PER_KEYWORD:
+                        completed.add(keyword)
+                        on_keyword_complete(keyword, keyword_tweets)
+
+        if all(len(tweets) >= TWEETS_PER_KEYWORD for tweets in tweets_by_keyword.values()):
+            break
+
+        scroll_and_load_tweets(driver)
+        max_attempts -= 1
+
+    if on_keyword_complete:
+        for keyword, tweets in tweets_by_keyword.items():
+            if keyword not in completed:
+                on_keyword_complete(keyword, tweets)
+
+    return tweets_by_keyword
+
+def extract_new_tweets_per_element(driver, used_tweets, keywords, matcher=None):
+    """Extract new relevant tweets by querying each article element separately"""
+    from selenium.webdriver.common.by import By
+
+    matcher = matcher or KeywordMatcher(keywords)
     tweets_by_keyword = {}
     
     for keyword in keywords:
         tweets_by_keyword[keyword] = []
         max_attempts = 10  # More attempts to find multiple tweets
         
-        while len(tweets_by_keyword[keyword]) < 5 and max_attempts > 0:
+        while len(tweets_by_keyword[keyword]) < TWEETS_PER_KEYWORD and max_attempts > 0:
             tweet_elements = driver.find_elements(By.XPATH, "//article[@data-testid='tweet']")
             
             for tweet in tweet_elements:
                 try:
                     tweet_text = tweet.find_element(By.XPATH, ".//div[@data-testid='tweetText']").text
-                    if tweet_text not in used_tweets and is_tweet_relevant(tweet_text, [keyword]):
+                    if keyword in matcher.find_all(tweet_text):
                         clean_text = clean_tweet_text(tweet_text)
-                        if clean_text not in tweets_by_keyword[keyword]:
+                        if clean_text not in used_tweets and clean_text not in tweets_by_keyword[keyword]:
                             tweets_by_keyword[keyword].append(clean_text)
-                            if len(tweets_by_keyword[keyword]) >= 5:
+                            if len(tweets_by_keyword[keyword]) >= TWEETS_PER_KEYWORD:
                                 break
                 except Exception as e:
                     print(f"Error extracting tweet: {e}")
                     continue
             
-            if len(tweets_by_keyword[keyword]) < 5:
+            if len(tweets_by_keyword[keyword]) < TWEETS_PER_KEYWORD:
                 scroll_and_load_tweets(driver)
                 max_attempts -= 1
     
     return tweets_by_keyword
 
-def generate_image_prompts(blog_content, keyword):
-    """Generate better image prompts for different sections of the blog"""
-    sections = blog_content.split('\n\n')
+def scrape_keywords_with_pool(used_tweets, keywords, username, password, workers=SCRAPE_WORKERS,
+                              session_file=TWITTER_SESSION_FILE, on_keyword_complete=None):
+    """Run a live search per keyword on a pool of headless Chrome workers"""
+    workers = max(1, min(workers, len(keywords)))
+    idle_drivers = queue.Queue()
+    drivers = []
+
+    def start_worker():
+        # Chrome locks its profile directory, so workers share the saved cookies instead
+        driver = create_driver(headless=True, profile_dir=None)
+        drivers.append(driver)
+        restore_twitter_session(driver, session_file)
+        idle_drivers.put(driver)
+
+    def scrape(keyword):
+        driver = idle_drivers.get()
+        try:
+            with span("scrape_keyword", keyword=keyword):
+                search_latest_ai_news(driver, build_search_query([keyword]))
+                with span("extraction", keyword=keyword) as extraction_span:
+                    tweets = extract_new_tweets(driver, used_tweets, [keyword])[keyword]
+                    extraction_span.set(tweets=len(tweets))
+            count("tweets_extracted", len(tweets))
+        finally:
+            idle_drivers.put(driver)
+        if on_keyword_complete:
+            on_keyword_complete(keyword, tweets)
+        return tweets
+
+    try:
+        # The first worker logs in if needed and saves the session the others restore
+        first_driver = create_driver(headless=True, profile_dir=None)
+        drivers.append(first_driver)
+        ensure_logged_in(first_driver, username, password, session_file, profile_dir=None)
+        idle_drivers.put(first_driver)
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(start_worker) for _ in range(workers - 1)]:
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error starting scraper worker: {e}")
+
+            futures = {keyword: pool.submit(scrape, keyword) for keyword in keywords}
+            tweets_by_keyword = {}
+            for keyword, future in futures.items():
+                try:
+                    tweets_by_keyword[keyword] = future.result()
+                except Exception as e:
+                    print(f"Error scraping keyword {keyword}: {e}")
+                    tweets_by_keyword[keyword] = []
+        return tweets_by_keyword
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Error closing scraper worker: {e}")
+
+def generate_image_prompts(keyword):
+    """Generate better image prompts for different sections of the blog.
+
+    The prompts only depend on the keyword, so they can be built before the
+    blog text exists.
+    """
     image_prompts = []
     
-    # Get the title from the first line
-    title = sections[0].strip().replace('#', '').strip()
-    
     # First image - realistic future vision
     intro_prompt = (
         f"Photorealistic image of {keyword} in a modern setting. "
@@ -162,6 +1049,148 @@ def generate_image_prompts(blog_content, keyword):
     
     return image_prompts
 
+class EndpointScheduler:
+    """Token bucket and shared backoff for every request to one API endpoint"""
+
+    def __init__(self, name, requests_per_minute, burst=None, base_delay=2.0, max_delay=60.0):
+        self.name = name
+        self.rate = requests_per_minute / 60.0
+        self.capacity = burst or max(1.0, requests_per_minute / 10.0)
+        self.tokens = self.capacity
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until this endpoint may receive another request"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                wait = self.blocked_until - now
+                if wait <= 0:
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def defer(self, seconds):
+        """Hold back every request to this endpoint for at least seconds"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def backoff(self, attempt, retry_after=None):
+        """Pause the endpoint after a failed attempt and return the delay.
+
+        Uses the server's hint when there is one, otherwise exponential backoff;
+        both are jittered so waiting callers do not retry in lockstep.
+        """
+        if retry_after is not None:
+            delay = min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        else:
+            delay = random.uniform(self.base_delay, min(self.max_delay, self.base_delay * 2 ** (attempt + 1)))
+        self.defer(delay)
+        return delay
+
+ENDPOINT_SCHEDULERS = {
+    "groq": EndpointScheduler("groq", GROQ_REQUESTS_PER_MINUTE),
+    "huggingface": EndpointScheduler("huggingface", HF_REQUESTS_PER_MINUTE, base_delay=5.0),
+}
+
+def parse_retry_after(headers):
+    """Return the Retry-After header in seconds, or None"""
+    value = headers.get('retry-after') if headers else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class ImageCache:
+    """Content-addressed image cache on disk with least-recently-used eviction"""
+
+    def __init__(self, cache_dir, max_bytes=IMAGE_CACHE_MAX_MB * 1024 * 1024, extension='.png'):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(model_url, prompt, parameters):
+        """Hash of everything that determines the generated image"""
+        payload = json.dumps({"model": model_url, "prompt": prompt, "parameters": parameters}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}{self.extension}")
+
+    def get(self, key):
+        """Return the cached image path, or None on a miss"""
+        path = self.path_for(key)
+        try:
+            # The modification time doubles as the last-used time for eviction
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key, data):
+        """Store image bytes under key and return their path"""
+        return self.put_chunks(key, [data])
+
+    def put_chunks(self, key, chunks):
+        """Write an image from an iterable of byte chunks without holding it in memory"""
+        path = self.path_for(key)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        os.replace(temp_path, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """Delete least recently used images until the cache fits max_bytes"""
+        with self.lock:
+            entries = []
+            for entry in os.scandir(self.cache_dir):
+                if entry.is_file() and entry.name.endswith(self.extension):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError as e:
+                    print(f"Error evicting cached image {path}: {e}")
+
+def counted_chunks(chunks, endpoint):
+    """Pass chunks through, adding their size to the downloaded bytes counter"""
+    for chunk in chunks:
+        count("downloaded_bytes", len(chunk), endpoint=endpoint)
+        yield chunk
+
 class HuggingFaceImageGenerator:
     def __init__(self):
         try:
@@ -175,8 +1204,18 @@ class HuggingFaceImageGenerator:
             }
             # Using a different model that's typically more available
             self.api_url = "https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-2-1"
+            
+            # One keep-alive session sized for the parallel image requests avoids a new TLS handshake per image
+            import requests
+            import requests.adapters
+
+            self.session = requests.Session()
+            self.session.headers.update(self.headers)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max(1, IMAGE_CONCURRENCY))
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
             self.image_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_images")
-            os.makedirs(self.image_dir, exist_ok=True)
+            self.cache = ImageCache(self.image_dir)
             
             print("Successfully initialized Hugging Face image generator")
             self.initialized = True
@@ -190,13 +1229,11 @@ class HuggingFaceImageGenerator:
             if not self.initialized:
                 return None
 
-            print(f"Generating image for prompt: {prompt}")
-            
             # Prepare the payload
             payload = {
                 "inputs": prompt,
                 "parameters": {
-                    "negative_prompt": "blurry, bad quality, distorted, ugly, bad art, poor details",
+                    "negative_prompt": IMAGE_NEGATIVE_PROMPT,
                     "num_inference_steps": 30,
                     "guidance_scale": 7.5,
                     "width": 768,
@@ -204,35 +1241,51 @@ class HuggingFaceImageGenerator:
                 }
             }
             
-            # Make API request with retry logic
+            # Identical requests produce interchangeable images, so reuse earlier results
+            cache_key = ImageCache.make_key(self.api_url, prompt, payload["parameters"])
+            cached_path = self.cache.get(cache_key)
+            if cached_path:
+                count("cache_hits", cache="image")
+                print(f"Using cached image: {cached_path}")
+                return cached_path
+            count("cache_misses", cache="image")
+            
+            print(f"Generating image for prompt: {prompt}")
+            
+            # Make API request with retry logic shared across all image requests
+            scheduler = ENDPOINT_SCHEDULERS["huggingface"]
             max_retries = 3
-            retry_delay = 20  # seconds
             
             for attempt in range(max_retries):
-                response = requests.post(self.api_url, headers=self.headers, json=payload)
-                
-                if response.status_code == 200:
-                    # Save the image
-                    timestamp = int(time.time())
-                    image_path = os.path.join(self.image_dir, f"generated_image_{timestamp}.png")
+                scheduler.acquire()
+                with span("image", attempt=attempt + 1) as image_span, \
+                        self.session.post(self.api_url, json=payload, stream=True, timeout=IMAGE_REQUEST_TIMEOUT) as response:
+                    image_span.set(status=response.status_code)
+                    if response.status_code == 200:
+                        # Stream the image straight to disk
+                        image_path = self.cache.put_chunks(
+                            cache_key, counted_chunks(response.iter_content(chunk_size=64 * 1024), "huggingface")
+                        )
+                        print(f"Image saved to: {image_path}")
+                        return image_path
                     
-                    with open(image_path, 'wb') as f:
-                        f.write(response.content)
-                    print(f"Image saved to: {image_path}")
-                    return image_path
+                    try:
+                        error_data = response.json()
+                    except ValueError:
+                        error_data = {}
+                    retry_after = parse_retry_after(response.headers)
+                    error_text = response.text
+                if isinstance(error_data, dict) and "estimated_time" in error_data:
+                    retry_after = float(error_data["estimated_time"])
+                    print(f"Model loading... Attempt {attempt + 1}/{max_retries}")
                 else:
-                    error_data = response.json()
-                    if "error" in error_data and "estimated_time" in error_data:
-                        wait_time = min(retry_delay, int(error_data["estimated_time"]) + 5)
-                        print(f"Model loading... Waiting {wait_time} seconds before retry. Attempt {attempt + 1}/{max_retries}")
-                        time.sleep(wait_time)
-                    else:
-                        print(f"Error generating image: {response.text}")
-                        if attempt < max_retries - 1:
-                            print(f"Retrying in {retry_delay} seconds... Attempt {attempt + 1}/{max_retries}")
-                            time.sleep(retry_delay)
-                        else:
-                            return None
+                    print(f"Error generating image: {error_text}")
+                
+                if attempt < max_retries - 1:
+                    # Every request to the endpoint waits, not just this one
+                    delay = scheduler.backoff(attempt, retry_after)
+                    count("retries", endpoint="huggingface")
+                    print(f"Retrying in {delay:.1f} seconds... Attempt {attempt + 1}/{max_retries}")
             
             print("Failed to generate image after all retries")
             return None
@@ -241,20 +1294,120 @@ class HuggingFaceImageGenerator:
             print(f"Error generating image: {e}")
             return None
 
-def generate_blogs(tweets_by_keyword, max_retries=3, retry_delay=5):
-    
-    """Generate comprehensive blog posts using Groq API with Mixtral model"""
-    blogs = []
-    image_generator = HuggingFaceImageGenerator()  # Using Hugging Face
+    # Each remote request carries a single prompt
+    batch_prompts = False
+
+    def generate_images(self, prompts):
+        """Generate one image per prompt; returns a path (or None) for each"""
+        return [self.generate_image(prompt) for prompt in prompts]
+
+# Diffusers pipelines loaded in this process, by model ID
+local_pipelines = {}
+local_pipeline_lock = threading.Lock()
+
+def load_local_pipeline(model_id):
+    """Load a diffusers pipeline once per process and keep it warm"""
+    with local_pipeline_lock:
+        if model_id not in local_pipelines:
+            # torch and diffusers are heavy and only needed for the local backend
+            import torch
+            from diffusers import AutoPipelineForText2Image
+
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            dtype = torch.float16 if device == "cuda" else torch.float32
+            print(f"Loading local image model {model_id} on {device}...")
+            pipeline = AutoPipelineForText2Image.from_pretrained(model_id, torch_dtype=dtype).to(device)
+            pipeline.set_progress_bar_config(disable=True)
+            local_pipelines[model_id] = pipeline
+        return local_pipelines[model_id]
+
+class LocalDiffusersImageGenerator:
+    """Same interface as HuggingFaceImageGenerator, but renders in-process with diffusers"""
+
+    batch_prompts = True
+
+    def __init__(self, model_id=LOCAL_IMAGE_MODEL, steps=LOCAL_IMAGE_STEPS, size=LOCAL_IMAGE_SIZE,
+                 guidance_scale=LOCAL_IMAGE_GUIDANCE):
+        try:
+            self.model_id = model_id
+            self.parameters = {
+                "num_inference_steps": steps,
+                "guidance_scale": guidance_scale,
+                "width": size,
+                "height": size
+            }
+            # Distilled models run without classifier-free guidance, which ignores negative prompts
+            if guidance_scale > 1:
+                self.parameters["negative_prompt"] = IMAGE_NEGATIVE_PROMPT
+            self.image_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated_images")
+            self.cache = ImageCache(self.image_dir)
+            self.pipeline = load_local_pipeline(model_id)
+            
+            print("Successfully initialized local diffusers image generator")
+            self.initialized = True
+            
+        except Exception as e:
+            print(f"Error initializing local diffusers generator: {e}")
+            self.initialized = False
+
+    def generate_image(self, prompt):
+        return self.generate_images([prompt])[0]
+
+    def generate_images(self, prompts):
+        """Render all uncached prompts in one pipeline call; returns a path (or None) for each"""
+        if not self.initialized:
+            return [None] * len(prompts)
+
+        cache_keys = [ImageCache.make_key(f"local:{self.model_id}", prompt, self.parameters) for prompt in prompts]
+        image_paths = [self.cache.get(cache_key) for cache_key in cache_keys]
+        missing = [index for index, image_path in enumerate(image_paths) if image_path is None]
+        count("cache_hits", len(prompts) - len(missing), cache="image")
+        count("cache_misses", len(missing), cache="image")
+        if not missing:
+            return image_paths
+
+        try:
+            print(f"Generating {len(missing)} images locally")
+            parameters = dict(self.parameters)
+            if "negative_prompt" in parameters:
+                parameters["negative_prompt"] = [parameters["negative_prompt"]] * len(missing)
+            # One pipeline call at a time; batching happens inside the call
+            with local_pipeline_lock, span("image", backend="local", batch=len(missing)):
+                result = self.pipeline(prompt=[prompts[index] for index in missing], **parameters)
+            for index, image in zip(missing, result.images):
+                buffer = io.BytesIO()
+                image.save(buffer, format="PNG")
+                image_paths[index] = self.cache.put(cache_keys[index], buffer.getvalue())
+                print(f"Image saved to: {image_paths[index]}")
+        except Exception as e:
+            print(f"Error generating images locally: {e}")
+        return image_paths
+
+def create_image_generator():
+    """Build the image generator selected by IMAGE_BACKEND"""
+    if IMAGE_BACKEND == "local":
+        return LocalDiffusersImageGenerator()
+    return HuggingFaceImageGenerator()
+
+image_generator_instance = None
+image_generator_lock = threading.Lock()
+
+def get_image_generator():
+    """Return the process-wide image generator, creating it on first use"""
+    global image_generator_instance
+    with image_generator_lock:
+        # A generator that failed to initialize is retried on the next call
+        if image_generator_instance is None or not image_generator_instance.initialized:
+            image_generator_instance = create_image_generator()
+        return image_generator_instance
+
+def build_blog_messages(keyword, tweets):
+    """Build the chat messages asking for a blog post about keyword"""
+    # Create a more focused prompt based on the tweets
+    tweet_insights = "\n".join([f"- {tweet}" for tweet in tweets])
     
-    for keyword, tweets in tweets_by_keyword.items():
-        for attempt in range(max_retries):
-            try:
-                # Create a more focused prompt based on the tweets
-                tweet_insights = "\n".join([f"- {tweet}" for tweet in tweets])
-                
-                # Enhanced prompt with better structure and examples
-                prompt = f"""Create an in-depth, professional blog post about {keyword} based on these insights:
+    # Enhanced prompt with better structure and examples
+    prompt = f"""Create an in-depth, professional blog post about {keyword} based on these insights:
 
 {tweet_insights}
 
@@ -316,308 +1469,1069 @@ Style Requirements:
 
 Focus on providing actionable insights and practical implications while maintaining technical accuracy."""
 
-                completion = client.chat.completions.create(
-                    model="mixtral-8x7b-32768",
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": (
-                                "You are an expert technology analyst and writer specializing in AI and emerging technologies. "
-                                "You excel at creating comprehensive, well-researched blog posts that blend technical depth with "
-                                "accessibility. Your writing is known for being data-driven, insightful, and engaging while maintaining "
-                                "professional standards and technical accuracy."
-                            )
-                        },
-                        {"role": "user", "content": prompt}
-                    ],
-                    temperature=0.7,
-                    max_tokens=4096
-                )
+    return [
+        {"role": "system", "content": BLOG_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
 
-                blog_content = completion.choices[0].message.content
-                
-                # Generate and add images with better error handling
-                image_prompts = generate_image_prompts(blog_content, keyword)
-                images = []
-                for section, img_prompt in image_prompts:
-                    try:
-                        image_path = image_generator.generate_image(img_prompt)
-                        if image_path and os.path.exists(image_path):
-                            images.append((section, image_path))
-                        else:
-                            print(f"Warning: Failed to generate image for {section}")
-                    except Exception as e:
-                        print(f"Error generating image for {section}: {e}")
-                        continue
-                
-                blogs.append({"content": blog_content, "images": images, "keyword": keyword})
-                break
-                
-            except Exception as e:
-                print(f"Error generating blog (attempt {attempt + 1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                else:
-                    print(f"Failed to generate blog for keyword: {keyword}")
-    
-    return blogs
+class CompletionCacheMiss(Exception):
+    """Raised in replay mode when a completion is not cached"""
 
-def generate_blog_with_images(keyword, tweets):
-    """Generate a blog post with images for the given keyword and tweets"""
-    try:
-        # Initialize Hugging Face image generator
-        image_generator = HuggingFaceImageGenerator()
-        
-        if not image_generator.initialized:
-            print("Warning: Image generator not initialized. Proceeding without images.")
-            return generate_blogs(keyword, tweets)
-        
-        # Generate blog content first
-        blog_content = generate_blog_content(keyword, tweets)
-        if not blog_content:
+class CompletionCache:
+    """On-disk cache of chat completions with TTL and size-based eviction"""
+
+    def __init__(self, db_filename=LLM_CACHE_DB, mode=LLM_CACHE_MODE,
+                 ttl_seconds=LLM_CACHE_TTL_HOURS * 3600, max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024):
+        self.mode = mode
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(db_filename, check_same_thread=False)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS completions "
+                "(key TEXT PRIMARY KEY, content TEXT NOT NULL, created REAL NOT NULL, "
+                "last_used REAL NOT NULL, size INTEGER NOT NULL)"
+            )
+
+    @staticmethod
+    def make_key(model, messages, temperature, max_tokens):
+        """Hash of everything that determines a completion"""
+        payload = json.dumps(
+            {"model": model, "messages": messages, "temperature": temperature, "max_tokens": max_tokens},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return the cached completion, or None on a miss"""
+        if self.mode == 'off':
             return None
-        
-        # Generate image prompts
-        image_prompts = generate_image_prompts(blog_content, keyword)
-        images = []
-        
-        # Generate images
-        for section, prompt in image_prompts:
-            image_path = image_generator.generate_image(prompt)
-            if image_path:
-                images.append((section, image_path))
+        now = time.time()
+        with self.lock:
+            row = self.connection.execute("SELECT content, created FROM completions WHERE key = ?", (key,)).fetchone()
+            # Replay mode serves whatever is cached, however old
+            if row and (self.mode == 'replay' or now - row[1] <= self.ttl_seconds):
+                with self.connection:
+                    self.connection.execute("UPDATE completions SET last_used = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                count("cache_hits", cache="llm")
+                return row[0]
+            self.misses += 1
+            count("cache_misses", cache="llm")
+            return None
+
+    def put(self, key, content):
+        """Store a completion and evict old entries past max_bytes"""
+        if self.mode == 'off':
+            return
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO completions (key, content, created, last_used, size) VALUES (?, ?, ?, ?, ?)",
+                (key, content, now, now, len(content.encode('utf-8')))
+            )
+            self.connection.execute("DELETE FROM completions WHERE created < ?", (now - self.ttl_seconds,))
+            total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+            if total > self.max_bytes:
+                for old_key, size in self.connection.execute(
+                    "SELECT key, size FROM completions WHERE key != ? ORDER BY last_used", (key,)
+                ).fetchall():
+                    self.connection.execute("DELETE FROM completions WHERE key = ?", (old_key,))
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+completion_cache = None
+completion_cache_lock = threading.Lock()
+
+def get_completion_cache():
+    """Return the process-wide completion cache, opening it on first use"""
+    global completion_cache
+    with completion_cache_lock:
+        if completion_cache is None:
+            completion_cache = CompletionCache()
+        return completion_cache
+
+def create_completion(messages, model=BLOG_MODEL, temperature=0.7, max_tokens=4096, max_retries=3):
+    """Return the completion text for messages, served from the cache when possible"""
+    cache = get_completion_cache()
+    key = cache.make_key(model, messages, temperature, max_tokens)
+    content = cache.get(key)
+    if content is not None:
+        return content
+    if cache.mode == 'replay':
+        raise CompletionCacheMiss(f"No cached completion for {key[:12]} in replay mode")
+
+    scheduler = ENDPOINT_SCHEDULERS["groq"]
+    for attempt in range(max_retries):
+        scheduler.acquire()
+        try:
+            with span("llm", model=model, attempt=attempt + 1):
+                completion = get_client().chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            break
+        except Exception as e:
+            # Client errors other than timeouts and rate limits will not succeed on retry
+            status_code = getattr(e, 'status_code', None)
+            if attempt == max_retries - 1 or (status_code and status_code < 500 and status_code not in (408, 409, 429)):
+                raise
+            response = getattr(e, 'response', None)
+            delay = scheduler.backoff(attempt, parse_retry_after(getattr(response, 'headers', None)))
+            count("retries", endpoint="groq")
+            print(f"Groq request failed: {e}. Retrying in {delay:.1f} seconds... Attempt {attempt + 1}/{max_retries}")
+
+    count_token_usage(getattr(completion, 'usage', None))
+    content = completion.choices[0].message.content
+    cache.put(key, content)
+    return content
+
+def count_token_usage(usage):
+    """Add a Groq usage report to the token counters"""
+    if usage is None:
+        return
+    for kind in ("prompt", "completion"):
+        tokens = getattr(usage, f"{kind}_tokens", None)
+        if tokens:
+            count("tokens", tokens, kind=kind)
+
+class SectionStreamParser:
+    """Split Markdown into heading-delimited sections while the text is still arriving"""
+
+    def __init__(self, on_section):
+        self.on_section = on_section
+        self.buffer = ''
+        self.level = 0
+        self.heading = None
+        self.lines = []
+
+    def feed(self, text):
+        # Only the new text is split; the buffer keeps just the unfinished last line
+        complete, newline, rest = text.rpartition('\n')
+        if not newline:
+            self.buffer += text
+            return
+        lines = (self.buffer + complete).split('\n')
+        self.buffer = rest
+        for line in lines:
+            self.add_line(line)
+
+    def add_line(self, line):
+        stripped = line.strip()
+        if stripped.startswith('#'):
+            # A new heading completes the previous section
+            self.emit()
+            self.level = len(stripped) - len(stripped.lstrip('#'))
+            self.heading = stripped.lstrip('#').strip()
+            self.lines = []
+        else:
+            self.lines.append(line)
+
+    def emit(self):
+        body = '\n'.join(self.lines).strip()
+        if self.heading is not None or body:
+            self.on_section({"level": self.level, "heading": self.heading, "body": body})
+
+    def close(self):
+        """Flush the last section once the text is complete"""
+        if self.buffer:
+            self.add_line(self.buffer)
+            self.buffer = ''
+        self.emit()
+        self.heading = None
+        self.lines = []
+
+# Lines starting a Markdown bullet or numbered list item
+BULLET_ITEM_PATTERN = re.compile(r'^\s*[-*+]\s+')
+NUMBERED_ITEM_PATTERN = re.compile(r'^\s*\d+[.)]\s+')
+
+def parse_section_blocks(body):
+    """Split a section body into ("paragraph", text), ("bullet_list", items) and ("numbered_list", items) blocks"""
+    blocks = []
+    for chunk in body.split('\n\n'):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        lines = chunk.split('\n')
+        kinds = [
+            "bullet_list" if BULLET_ITEM_PATTERN.match(line) else
+            "numbered_list" if NUMBERED_ITEM_PATTERN.match(line) else None
+            for line in lines
+        ]
+        if None in kinds:
+            blocks.append(("paragraph", chunk))
+            continue
+        # A chunk that switches between bullets and numbers becomes one list per run
+        items = []
+        for index, (line, kind) in enumerate(zip(lines, kinds)):
+            pattern = BULLET_ITEM_PATTERN if kind == "bullet_list" else NUMBERED_ITEM_PATTERN
+            items.append(pattern.sub('', line, count=1).strip())
+            if index + 1 == len(lines) or kinds[index + 1] != kind:
+                blocks.append((kind, items))
+                items = []
+    return blocks
+
+def parse_blog(content):
+    """Parse a completion once into {"title", "sections"}.
+
+    Each section is {"level", "heading", "blocks"}; heading is None for text
+    that comes before any heading.
+    """
+    sections = []
+    parser = SectionStreamParser(sections.append)
+    parser.feed(content)
+    parser.close()
+
+    # The first top-level heading is the title; otherwise fall back to the first heading or line
+    title_index = next((index for index, section in enumerate(sections) if section["level"] == 1), None)
+    if title_index is None:
+        title_index = next((index for index, section in enumerate(sections) if section["heading"]), None)
+    if title_index is not None:
+        title = sections[title_index]["heading"]
+        title_body = sections[title_index]["body"]
+        sections = sections[:title_index] + sections[title_index + 1:]
+        if title_body:
+            sections.insert(title_index, {"level": 0, "heading": None, "body": title_body})
+    elif sections:
+        title, _, rest = sections[0]["body"].partition('\n')
+        sections[0]["body"] = rest
+    else:
+        title = ''
+
+    return {
+        "title": title.strip(),
+        "sections": [
+            {"level": section["level"], "heading": section["heading"], "blocks": parse_section_blocks(section["body"])}
+            for section in sections
+        ],
+    }
+
+def plan_image_placement(blog_tree, images):
+    """Decide where each image goes, checking each file once.
+
+    Returns {(position, section index): image path} with position "before" or
+    "after"; section index -1 stands for the title.
+    """
+    available = {}
+    for section, image_path in images:
+        if section not in available and image_path and os.path.exists(image_path):
+            available[section] = image_path
+
+    sections = blog_tree["sections"]
+    placement = {}
+
+    # Intro image right after the title
+    if "intro" in available:
+        placement[("after", -1)] = available["intro"]
+
+    # Middle image after the first heading in the second half of the blog
+    middle_index = next(
+        (index for index in range(len(sections) // 2, len(sections)) if sections[index]["heading"]), None
+    )
+    if "middle" in available and middle_index is not None:
+        placement[("after", middle_index)] = available["middle"]
+
+    # Conclusion image before the conclusion heading
+    conclusion_index = next(
+        (index for index, section in enumerate(sections)
+         if section["heading"] and "conclusion" in section["heading"].lower()), None
+    )
+    if "conclusion" in available and conclusion_index is not None:
+        placement[("before", conclusion_index)] = available["conclusion"]
+
+    return placement
+
+# Time to first token and throughput of every streamed completion
+completion_stats = []
+
+def stream_completion(messages, on_text=None, model=BLOG_MODEL, temperature=0.7, max_tokens=4096, max_retries=3):
+    """Stream a completion, passing each text delta to on_text; returns (content, stats)"""
+    cache = get_completion_cache()
+    key = cache.make_key(model, messages, temperature, max_tokens)
+    content = cache.get(key)
+    if content is not None:
+        if on_text:
+            on_text(content)
+        return content, {"cached": True}
+    if cache.mode == 'replay':
+        raise CompletionCacheMiss(f"No cached completion for {key[:12]} in replay mode")
+
+    scheduler = ENDPOINT_SCHEDULERS["groq"]
+    for attempt in range(max_retries):
+        scheduler.acquire()
+        parts = []
+        start = time.monotonic()
+        first_token = None
+        usage = None
+        try:
+            with span("llm", model=model, attempt=attempt + 1, stream=True) as llm_span:
+                stream = get_client().chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True
+                )
+                chunk_count = 0
+                for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        if first_token is None:
+                            first_token = time.monotonic()
+                            llm_span.set(time_to_first_token=round(first_token - start, 6))
+                        chunk_count += 1
+                        parts.append(delta)
+                        if on_text:
+                            on_text(delta)
+                    # Groq reports token usage on the final chunk
+                    usage = getattr(getattr(chunk, 'x_groq', None), 'usage', None) or usage
+            break
+        except Exception as e:
+            # Text already handed to on_text cannot be taken back, so only retry before the first token
+            status_code = getattr(e, 'status_code', None)
+            if (parts or attempt == max_retries - 1
+                    or (status_code and status_code < 500 and status_code not in (408, 409, 429))):
+                raise
+            response = getattr(e, 'response', None)
+            delay = scheduler.backoff(attempt, parse_retry_after(getattr(response, 'headers', None)))
+            count("retries", endpoint="groq")
+            print(f"Groq request failed: {e}. Retrying in {delay:.1f} seconds... Attempt {attempt + 1}/{max_retries}")
+
+    end = time.monotonic()
+    if usage is not None:
+        count_token_usage(usage)
+    else:
+        count("tokens", chunk_count, kind="completion")
+    content = ''.join(parts)
+    tokens = getattr(usage, 'completion_tokens', None) or chunk_count
+    first_token = first_token or end
+    stats = {
+        "cached": False,
+        "time_to_first_token": first_token - start,
+        "tokens": tokens,
+        "tokens_per_second": tokens / (end - first_token) if end > first_token else 0.0,
+    }
+    completion_stats.append(stats)
+    cache.put(key, content)
+    return content, stats
+
+def generate_blog_content(keyword, tweets, on_section=None):
+    """Generate blog content using Groq API with Mixtral model.
+
+    on_section(section) receives each Markdown section as soon as it is complete.
+    """
+    try:
+        with span("blog", keyword=keyword, tweets=len(tweets)):
+            parser = SectionStreamParser(on_section) if on_section else None
+            messages = build_blog_messages(keyword, tweets)
+            if LLM_STREAM:
+                blog_content, stats = stream_completion(messages, parser.feed if parser else None)
+                if not stats["cached"]:
+                    print(
+                        f"Blog for {keyword}: first token after {stats['time_to_first_token']:.2f}s, "
+                        f"{stats['tokens_per_second']:.1f} tokens/s"
+                    )
             else:
-                print(f"Warning: Failed to generate image for {section}")
-        
-        return {"keyword": keyword, "content": blog_content, "images": images}
+                blog_content = create_completion(messages)
+                if parser:
+                    parser.feed(blog_content)
+            if parser:
+                parser.close()
+            return blog_content
         
     except Exception as e:
-        print(f"Error generating blog with images: {e}")
+        print(f"Error generating blog content: {e}")
         return None
 
-def generate_blog_content(keyword, tweets):
-    """Generate blog content using Groq API with Mixtral model"""
-    try:
-        # Create a more focused prompt based on the tweets
-        tweet_insights = "\n".join([f"- {tweet}" for tweet in tweets])
-        
-        # Enhanced prompt with better structure and examples
-        prompt = f"""Create an in-depth, professional blog post about {keyword} based on these insights:
+def generate_blogs_concurrently(tweets_by_keyword, llm_concurrency=LLM_CONCURRENCY, image_concurrency=IMAGE_CONCURRENCY):
+    """Generate blogs for all keywords in parallel, returned in keyword order"""
+    image_generator = get_image_generator()
+    if not image_generator.initialized:
+        print("Warning: Image generator not initialized. Proceeding without images.")
 
-{tweet_insights}
+    contents = {}
+    trees = {}
+    image_futures = {}
+    with ThreadPoolExecutor(max_workers=llm_concurrency) as llm_pool, \
+            ThreadPoolExecutor(max_workers=image_concurrency) as image_pool:
+        content_futures = {
+            llm_pool.submit(generate_blog_content, keyword, tweets): keyword
+            for keyword, tweets in tweets_by_keyword.items()
+        }
 
-Structure your response following this exact format:
+        # Start a blog's images as soon as its text is ready; the LLM slot is freed meanwhile
+        for future in as_completed(content_futures):
+            keyword = content_futures[future]
+            blog_content = future.result()
+            contents[keyword] = blog_content
+            if blog_content:
+                # Parse once; the docx writer reuses the tree
+                trees[keyword] = parse_blog(blog_content)
+            if blog_content and image_generator.initialized:
+                image_futures[keyword] = submit_image_jobs(
+                    image_pool, image_generator, generate_image_prompts(keyword)
+                )
 
-# [Write an SEO-optimized, attention-grabbing title]
+        blogs = []
+        for keyword in tweets_by_keyword:
+            blog_content = contents.get(keyword)
+            if not blog_content:
+                print(f"Failed to generate blog for keyword: {keyword}")
+                continue
 
-## Introduction
-[Write a compelling 150-word introduction that:
-- Starts with a powerful hook or surprising statistic
-- Introduces {keyword} and its significance
-- Outlines the key themes from the collected insights
-- Sets up the main points to be discussed]
+            requested = image_futures.get(keyword, [])
+            blogs.append({
+                "keyword": keyword, "content": blog_content, "tree": trees[keyword],
+                "images": collect_images(requested), "images_requested": len(requested),
+            })
 
-## Current State of {keyword}
-[Write 250 words analyzing:
-- Latest developments and breakthroughs
-- Key players and their contributions
-- Current challenges and opportunities
-- Market trends and adoption rates]
+    return blogs
 
-## Technical Deep Dive
-[Write 300 words covering:
-- Core technologies and methodologies
-- Technical specifications and requirements
-- Implementation considerations
-- Best practices and standards]
+def submit_image_jobs(image_pool, image_generator, image_prompts):
+    """Queue (section, prompt) pairs on image_pool; returns (section, future) pairs"""
+    if not image_generator.batch_prompts:
+        return [(section, image_pool.submit(image_generator.generate_image, prompt)) for section, prompt in image_prompts]
 
-## Impact Analysis
-[Write 200 words examining:
-- Industry implications
-- Business transformations
-- Economic effects
-- Societal changes]
+    # Batching backends render all of a blog's prompts in one call
+    batch = image_pool.submit(image_generator.generate_images, [prompt for _, prompt in image_prompts])
+    section_futures = [(section, Future()) for section, _ in image_prompts]
 
-## Future Outlook
-[Write 200 words discussing:
-- Predicted developments
-- Upcoming challenges
-- Potential breakthroughs
-- Industry predictions]
+    def split_batch(done):
+        try:
+            image_paths = done.result()
+        except Exception as e:
+            for _, future in section_futures:
+                future.set_exception(e)
+            return
+        for (_, future), image_path in zip(section_futures, image_paths):
+            future.set_result(image_path)
 
-## Conclusion
-[Write a 150-word conclusion that:
-- Summarizes key points
-- Provides actionable insights
-- Ends with a thought-provoking statement
-- Encourages further exploration]
+    batch.add_done_callback(split_batch)
+    return section_futures
 
-Style Requirements:
-1. Use clear, authoritative language
-2. Include specific examples and data points
-3. Break down complex concepts
-4. Use industry-standard terminology
-5. Maintain a professional tone
-6. Format with proper Markdown headings
-7. Include relevant statistics when possible
-8. Use short paragraphs for readability
+def collect_images(image_futures):
+    """Wait for (section, future) image jobs and keep the ones that produced a file"""
+    images = []
+    for section, image_future in image_futures:
+        try:
+            image_path = image_future.result()
+        except Exception as e:
+            print(f"Error generating image for {section}: {e}")
+            image_path = None
+        if image_path:
+            images.append((section, image_path))
+        else:
+            print(f"Warning: Failed to generate image for {section}")
+    return images
 
-Focus on providing actionable insights and practical implications while maintaining technical accuracy."""
+def run_streaming_pipeline(scrape, llm_concurrency=LLM_CONCURRENCY, image_concurrency=IMAGE_CONCURRENCY,
+                           queue_size=PIPELINE_QUEUE_SIZE, on_blog_saved=None, on_keyword_failed=None,
+                           docx_workers=DOCX_WORKERS):
+    """Overlap scraping, blog text, images and docx writing through bounded queues.
 
-        completion = client.chat.completions.create(
-            model="mixtral-8x7b-32768",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an expert technology analyst and writer specializing in AI and emerging technologies. "
-                        "You excel at creating comprehensive, well-researched blog posts that blend technical depth with "
-                        "accessibility. Your writing is known for being data-driven, insightful, and engaging while maintaining "
-                        "professional standards and technical accuracy."
-                    )
-                },
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=4096
+    scrape(on_keyword_ready) must call on_keyword_ready(keyword, tweets) as soon as
+    each keyword's tweets are collected. on_blog_saved(blog, filepath) runs after
+    each document is written. An error in one keyword does not stop the others;
+    once every stage has finished, on_keyword_failed(keyword, error) is called for
+    each keyword that produced no document. Documents are written by docx_workers
+    threads, each handing its blog to a shared process pool when docx_workers > 1.
+    Returns the saved blogs in completion order.
+    """
+    tweet_queue = queue.Queue(maxsize=queue_size)
+    content_queue = queue.Queue(maxsize=queue_size)
+    # Holds blogs whose images are in flight, which also caps how many there are
+    image_queue = queue.Queue(maxsize=queue_size)
+    docx_queue = queue.Queue(maxsize=queue_size)
+    image_generator = get_image_generator()
+    if not image_generator.initialized:
+        print("Warning: Image generator not initialized. Proceeding without images.")
+    blogs = []
+    failures = []
+
+    def fail(keyword, error):
+        print(f"Failed to generate blog for keyword {keyword}: {error}")
+        failures.append((keyword, error))
+
+    def write_text(image_pool):
+        while True:
+            item = tweet_queue.get()
+            if item is None:
+                return
+            keyword, tweets = item
+            image_futures = []
+
+            def start_images(section):
+                # Images start with the title, once the completion is known to be producing a blog
+                if image_futures or not image_generator.initialized or section["level"] != 1:
+                    return
+                image_futures.extend(submit_image_jobs(image_pool, image_generator, generate_image_prompts(keyword)))
+
+            try:
+                blog_content = generate_blog_content(keyword, tweets, on_section=start_images if LLM_STREAM else None)
+            except Exception as e:
+                fail(keyword, e)
+                continue
+            if blog_content:
+                content_queue.put((keyword, blog_content, image_futures or None))
+            else:
+                fail(keyword, "no content was generated")
+
+    def request_images(image_pool):
+        try:
+            while True:
+                item = content_queue.get()
+                if item is None:
+                    return
+                keyword, blog_content, image_futures = item
+                try:
+                    blog_tree = parse_blog(blog_content)
+                    if image_futures is None:
+                        image_futures = []
+                        if image_generator.initialized:
+                            image_futures = submit_image_jobs(
+                                image_pool, image_generator, generate_image_prompts(keyword)
+                            )
+                except Exception as e:
+                    fail(keyword, e)
+                    continue
+                image_queue.put(({"keyword": keyword, "content": blog_content, "tree": blog_tree}, image_futures))
+        finally:
+            image_queue.put(None)
+
+    def assemble_blogs():
+        try:
+            while True:
+                item = image_queue.get()
+                if item is None:
+                    return
+                blog, image_futures = item
+                try:
+                    blog["images"] = collect_images(image_futures)
+                    blog["images_requested"] = len(image_futures)
+                except Exception as e:
+                    fail(blog["keyword"], e)
+                    continue
+                docx_queue.put(blog)
+        finally:
+            # One end marker per document writer
+            for _ in range(docx_workers):
+                docx_queue.put(None)
+
+    def write_documents(docx_pool):
+        while True:
+            blog = docx_queue.get()
+            if blog is None:
+                return
+            try:
+                if docx_pool:
+                    filepath = finish_pool_save(blog, docx_pool.submit(save_blog_in_worker, blog, BLOG_DIR))
+                else:
+                    filepath = save_blog_to_word(blog)
+                if not filepath:
+                    fail(blog["keyword"], "the document was not saved")
+                    continue
+                blogs.append(blog)
+                if on_blog_saved:
+                    on_blog_saved(blog, filepath)
+            except Exception as e:
+                fail(blog["keyword"], e)
+
+    ensure_blog_directory()
+    docx_workers = max(1, docx_workers)
+    docx_pool = None
+    if docx_workers > 1:
+        # Building and zipping documents is CPU-bound, so the writers hand it to processes
+        from concurrent.futures import ProcessPoolExecutor
+        docx_pool = ProcessPoolExecutor(max_workers=docx_workers)
+        # Start the worker processes now, before the stage threads exist
+        docx_pool.submit(int).result()
+
+    try:
+        with ThreadPoolExecutor(max_workers=image_concurrency) as image_pool:
+            text_threads = [
+                threading.Thread(target=write_text, args=(image_pool,), daemon=True) for _ in range(llm_concurrency)
+            ]
+            other_threads = [
+                threading.Thread(target=request_images, args=(image_pool,), daemon=True),
+                threading.Thread(target=assemble_blogs, daemon=True),
+            ] + [
+                threading.Thread(target=write_documents, args=(docx_pool,), daemon=True) for _ in range(docx_workers)
+            ]
+            for thread in text_threads + other_threads:
+                thread.start()
+
+            try:
+                scrape(lambda keyword, tweets: tweet_queue.put((keyword, tweets)))
+            finally:
+                # Each stage passes the end marker on once everything upstream has drained
+                for _ in text_threads:
+                    tweet_queue.put(None)
+                for thread in text_threads:
+                    thread.join()
+                content_queue.put(None)
+                for thread in other_threads:
+                    thread.join()
+    finally:
+        if docx_pool:
+            docx_pool.shutdown()
+
+    if on_keyword_failed:
+        for keyword, error in failures:
+            on_keyword_failed(keyword, error)
+    return blogs
+
+def prepare_docx_image(image_path, width_inches=DOCX_IMAGE_WIDTH_INCHES, dpi=DOCX_IMAGE_DPI,
+                       quality=DOCX_IMAGE_QUALITY):
+    """Downscale and re-encode an image for embedding, reusing earlier results.
+
+    Returns the path of a JPEG sized to the display width, or the original
+    path if it cannot be converted.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return image_path
+
+    try:
+        max_pixels = int(width_inches * dpi)
+        # Keyed on the source bytes, since a regenerated image can come back under the same name
+        with open(image_path, 'rb') as f:
+            source_key = hashlib.sha256(f.read()).hexdigest()
+        key = f"{source_key}-{max_pixels}px-q{quality}"
+        cache = ImageCache(
+            os.path.join(os.path.dirname(os.path.abspath(image_path)), "docx"),
+            DOCX_IMAGE_CACHE_MAX_MB * 1024 * 1024, extension='.jpg'
         )
+        prepared_path = cache.get(key)
+        if prepared_path:
+            return prepared_path
 
-        blog_content = completion.choices[0].message.content
-        return blog_content
-        
+        with Image.open(image_path) as image:
+            image = image.convert("RGB")
+            image.thumbnail((max_pixels, max_pixels), Image.LANCZOS)
+            buffer = io.BytesIO()
+            image.save(buffer, format="JPEG", quality=quality, optimize=True, progressive=True)
+        return cache.put(key, buffer.getvalue())
     except Exception as e:
-        print(f"Error generating blog content: {e}")
-        return None
+        print(f"Error preparing image {image_path}: {e}")
+        return image_path
 
-def save_blogs_to_word(blogs):
-    """Save generated blogs to Word documents with images"""
-    ensure_blog_directory()
-    
-    for blog in blogs:
-        try:
-            doc = Document()
-            content = blog["content"]
-            images = blog["images"]
-            keyword = blog["keyword"]
-            
-            # Track which images have been added
-            added_images = {"intro": False, "middle": False, "conclusion": False}
-            
-            # Split the blog content into sections
-            sections = content.split('\n\n')
-            
-            # Add title
-            title = sections[0].strip().replace('#', '').strip()
-            doc.add_heading(title, 0)
+def add_blog_image(doc, image_path, label):
+    """Add a centered image paragraph to the document"""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Inches
+
+    try:
+        paragraph = doc.add_paragraph()
+        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        run = paragraph.add_run()
+        run.add_picture(prepare_docx_image(image_path), width=Inches(DOCX_IMAGE_WIDTH_INCHES))
+        print(f"Successfully added {label} image from {image_path}")
+    except Exception as e:
+        print(f"Error adding {label} image: {e}")
+
+def add_numbered_list(doc, items):
+    """Add items as a 'List Number' list that starts again at 1"""
+    paragraphs = [doc.add_paragraph(item, style='List Number') for item in items]
+    # Every 'List Number' paragraph shares one numbering, which would continue
+    # from the previous list, so each list gets its own numbering restarted at 1
+    try:
+        numbering = doc.part.numbering_part.numbering_definitions._numbering
+        style_num_id = doc.styles['List Number']._element.pPr.numPr.numId.val
+        abstract_num_id = numbering.num_having_numId(style_num_id).abstractNumId.val
+        num = numbering.add_num(abstract_num_id)
+        num.add_lvlOverride(ilvl=0).add_startOverride(1)
+        for paragraph in paragraphs:
+            paragraph._p.get_or_add_pPr().get_or_add_numPr().get_or_add_numId().val = num.numId
+    except Exception as e:
+        print(f"Error restarting list numbering: {e}")
+
+def build_blog_document(blog):
+    """Build the Word document for a blog from its parsed section tree"""
+    from docx import Document
+
+    with span("docx_build", keyword=blog["keyword"]):
+        doc = Document()
+        blog_tree = blog.get("tree") or parse_blog(blog["content"])
+        placement = plan_image_placement(blog_tree, blog["images"])
+        
+        # Add title
+        doc.add_heading(blog_tree["title"], 0)
+        if ("after", -1) in placement:
+            add_blog_image(doc, placement[("after", -1)], "intro")
+        
+        # Process each section
+        for index, section in enumerate(blog_tree["sections"]):
+            if ("before", index) in placement:
+                add_blog_image(doc, placement[("before", index)], "conclusion")
             
-            # Add intro image right after title
-            for section, image_path in images:
-                if section == "intro" and image_path and os.path.exists(image_path):
-                    try:
-                        paragraph = doc.add_paragraph()
-                        paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                        run = paragraph.add_run()
-                        run.add_picture(image_path, width=Inches(4))
-                        print(f"Successfully added intro image from {image_path}")
-                        added_images["intro"] = True
-                        break
-                    except Exception as e:
-                        print(f"Error adding intro image: {e}")
+            if section["heading"]:
+                doc.add_heading(section["heading"], min(max(section["level"], 1), 9))
             
-            # Process each section
-            current_section = 1  # Skip title section
-            middle_section = len(sections) // 2
+            if ("after", index) in placement:
+                add_blog_image(doc, placement[("after", index)], "middle")
             
-            while current_section < len(sections):
-                section_text = sections[current_section].strip()
-                if not section_text:
-                    current_section += 1
-                    continue
-                
-                # Check if it's a heading
-                if section_text.startswith('#'):
-                    level = min(section_text.count('#'), 9)
-                    text = section_text.lstrip('#').strip()
-                    
-                    # Check if this is the conclusion section
-                    if "conclusion" in text.lower() and not added_images["conclusion"]:
-                        # Add conclusion image before conclusion heading
-                        for section, image_path in images:
-                            if section == "conclusion" and image_path and os.path.exists(image_path):
-                                try:
-                                    paragraph = doc.add_paragraph()
-                                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                                    run = paragraph.add_run()
-                                    run.add_picture(image_path, width=Inches(4))
-                                    print(f"Successfully added conclusion image from {image_path}")
-                                    added_images["conclusion"] = True
-                                    break
-                                except Exception as e:
-                                    print(f"Error adding conclusion image: {e}")
-                    
-                    # Add the heading
-                    doc.add_heading(text, level)
-                    
-                    # Add middle image after the first major heading if not added
-                    if current_section >= middle_section and not added_images["middle"]:
-                        for section, image_path in images:
-                            if section == "middle" and image_path and os.path.exists(image_path):
-                                try:
-                                    paragraph = doc.add_paragraph()
-                                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                                    run = paragraph.add_run()
-                                    run.add_picture(image_path, width=Inches(4))
-                                    print(f"Successfully added middle image from {image_path}")
-                                    added_images["middle"] = True
-                                    break
-                                except Exception as e:
-                                    print(f"Error adding middle image: {e}")
+            for kind, value in section["blocks"]:
+                if kind == "bullet_list":
+                    for item in value:
+                        doc.add_paragraph(item, style='List Bullet')
+                elif kind == "numbered_list":
+                    add_numbered_list(doc, value)
                 else:
-                    # Add regular paragraph
-                    doc.add_paragraph(section_text)
-                
-                current_section += 1
-            
-            # Save the document
-            filename = f"blog_{keyword}_{time.strftime('%Y%m%d_%H%M%S')}.docx"
-            filepath = os.path.join(BLOG_DIR, filename)
+                    doc.add_paragraph(value)
+        
+        return doc
+
+def save_blog_to_word(blog, blog_dir=None):
+    """Build and save one blog to blog_dir (default BLOG_DIR); returns the saved path or None"""
+    try:
+        doc = build_blog_document(blog)
+        
+        # Save the document
+        filename = f"blog_{blog['keyword']}_{time.strftime('%Y%m%d_%H%M%S')}.docx"
+        filepath = os.path.join(blog_dir or BLOG_DIR, filename)
+        with span("docx_save", keyword=blog['keyword']):
             doc.save(filepath)
-            print(f"Saved blog to: {filepath}")
-            
-        except Exception as e:
-            print(f"Error saving blog: {e}")
+        count("documents_saved")
+        print(f"Saved blog to: {filepath}")
+        return filepath
+        
+    except Exception as e:
+        print(f"Error saving blog: {e}")
+        return None
+
+def save_blog_in_worker(blog, blog_dir):
+    """save_blog_to_word in a pool process; also returns the metrics it recorded for the parent to merge"""
+    # The process may be forked from the parent or reused, so only this blog's metrics are kept
+    with metrics_lock:
+        metric_counters.clear()
+        metric_durations.clear()
+    filepath = save_blog_to_word(blog, blog_dir)
+    with metrics_lock:
+        return filepath, dict(metric_counters), dict(metric_durations)
 
-def delete_previous_blog_files():
-    """Delete previous blog files"""
+def save_blogs_to_word(blogs, workers=DOCX_WORKERS):
+    """Save generated blogs to Word documents with images"""
     ensure_blog_directory()
-    for file in glob.glob(os.path.join(BLOG_DIR, "*.docx")):
-        try:
-            os.remove(file)
-            print(f"Deleted: {file}")
-        except Exception as e:
-            print(f"Error deleting {file}: {e}")
+    
+    workers = min(workers, len(blogs))
+    if workers > 1:
+        # Building and zipping documents is CPU-bound, so spread it over processes
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(save_blog_in_worker, blog, BLOG_DIR) for blog in blogs]
+            return [finish_pool_save(blog, future) for blog, future in zip(blogs, futures)]
+    
+    return [save_blog_to_word(blog) for blog in blogs]
 
-def load_used_tweets(csv_filename):
-    """Load previously used tweets from CSV"""
+def finish_pool_save(blog, future):
+    """Wait for a save_blog_in_worker future and merge its metrics; returns the saved path or None"""
     try:
-        df = pd.read_csv(csv_filename)
-        # Check if 'tweet' column exists
-        if 'tweet' in df.columns:
-            return set(df['tweet'].values)
-        else:
-            print(f"Warning: 'tweet' column not found in {csv_filename}")
-            return set()
-    except FileNotFoundError:
-        print(f"No previous tweets file found at {csv_filename}")
-        return set()
+        filepath, counters, durations = future.result()
+        merge_metrics(counters, durations)
+        return filepath
     except Exception as e:
-        print(f"Error loading tweets: {e}")
-        return set()
+        # A worker that died (or a blog that cannot be pickled) is written here instead
+        print(f"Error writing {blog['keyword']} in a worker process, writing it here: {e}")
+        return save_blog_to_word(blog)
+
+def blog_input_hash(keyword, tweets):
+    """Hash of everything that determines a keyword's blog: tweets, prompts, model and image settings"""
+    image_config = {"backend": IMAGE_BACKEND, "docx": [DOCX_IMAGE_WIDTH_INCHES, DOCX_IMAGE_DPI, DOCX_IMAGE_QUALITY]}
+    if IMAGE_BACKEND == "local":
+        image_config["local"] = [LOCAL_IMAGE_MODEL, LOCAL_IMAGE_STEPS, LOCAL_IMAGE_SIZE, LOCAL_IMAGE_GUIDANCE]
+    payload = json.dumps({
+        "prompt_version": BLOG_PROMPT_VERSION,
+        "model": BLOG_MODEL,
+        "messages": build_blog_messages(keyword, tweets),
+        "image_prompts": generate_image_prompts(keyword),
+        "images": image_config,
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class BlogManifest:
+    """JSON record of the inputs and output file of every saved blog"""
+
+    def __init__(self, filename=BLOG_MANIFEST_FILE):
+        self.filename = filename
+        self.blog_dir = os.path.dirname(os.path.abspath(filename))
+        self.lock = threading.Lock()
+        self.entries = {}
+        # Without a manifest the directory may still hold blogs from before it existed
+        self.is_new = not os.path.exists(filename)
+        if not self.is_new:
+            try:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Error reading blog manifest, regenerating all blogs: {e}")
+                self.is_new = True
+
+    def path_for(self, keyword):
+        entry = self.entries.get(keyword)
+        return os.path.join(self.blog_dir, entry["file"]) if entry else None
+
+    def saved_tweets(self, keyword):
+        """Tweets the keyword's saved blog was built from ([] if unknown)"""
+        entry = self.entries.get(keyword)
+        return entry.get("tweets", []) if entry else []
+
+    def needs_update(self, keyword, tweets, input_hash=None):
+        """True unless the keyword's saved blog was built from the same inputs.
+
+        Pass saved_tweets(keyword) when there are no new tweets, so a changed
+        prompt version, model or image setting still regenerates the blog.
+        """
+        filepath = self.path_for(keyword)
+        if not filepath or not os.path.exists(filepath):
+            return True
+        entry = self.entries[keyword]
+        if entry.get("images_missing"):
+            return True
+        if not tweets:
+            # Entries written before tweets were recorded cannot be rebuilt
+            return False
+        return entry["hash"] != (input_hash or blog_input_hash(keyword, tweets))
+
+    def record(self, keyword, input_hash, filepath, images_missing=False, tweets=None):
+        """Point keyword at its new file, delete the file it replaces and save the manifest"""
+        with self.lock:
+            previous_path = self.path_for(keyword)
+            self.entries[keyword] = {
+                "hash": input_hash,
+                "file": os.path.basename(filepath),
+                "images_missing": images_missing,
+                "tweets": list(tweets or []),
+                "updated": time.strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            self.save()
+        if previous_path and os.path.abspath(previous_path) != os.path.abspath(filepath):
+            self.remove_file(previous_path)
+
+    def prune(self, keywords):
+        """Drop blogs of keywords that are no longer searched for.
+
+        On the first run with a manifest, also delete the blog files that are not in it.
+        """
+        with self.lock:
+            stale = [keyword for keyword in self.entries if keyword not in keywords]
+            stale_paths = [self.path_for(keyword) for keyword in stale]
+            for keyword in stale:
+                del self.entries[keyword]
+            if self.is_new:
+                current = {entry["file"] for entry in self.entries.values()}
+                stale_paths.extend(
+                    path for path in glob.glob(os.path.join(self.blog_dir, "*.docx"))
+                    if os.path.basename(path) not in current
+                )
+                self.is_new = False
+            self.save()
+        for path in stale_paths:
+            self.remove_file(path)
+
+    def save(self):
+        temp_filename = f"{self.filename}.{uuid.uuid4().hex}.tmp"
+        with open(temp_filename, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+        os.replace(temp_filename, self.filename)
+
+    @staticmethod
+    def remove_file(path):
+        try:
+            os.remove(path)
+            print(f"Deleted: {path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error deleting {path}: {e}")
+
+def tweet_hash(tweet):
+    """Fixed-size digest used as the dedupe key of a cleaned tweet"""
+    return hashlib.blake2b(tweet.encode('utf-8'), digest_size=16).digest()
+
+class UsedTweetStore:
+    """Indexed history of used tweets, keyed by a hash of the cleaned text"""
+
+    def __init__(self, db_filename=USED_TWEETS_DB, min_similarity=NEAR_DUPLICATE_MIN_SIMILARITY):
+        self.db_filename = db_filename
+        # Scraper workers share one store, so every use of the connection holds the lock
+        self.connection = sqlite3.connect(db_filename, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.pending = {}
+        self.min_similarity = min_similarity
+        self.pending_minhashes = MinHashIndex(min_similarity)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS used_tweets "
+                "(hash BLOB PRIMARY KEY, tweet TEXT NOT NULL, timestamp TEXT NOT NULL) WITHOUT ROWID"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS imports (filename TEXT PRIMARY KEY, timestamp TEXT NOT NULL)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS minhashes (hash BLOB PRIMARY KEY, signature BLOB NOT NULL) WITHOUT ROWID"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS minhash_bands "
+                "(band INTEGER NOT NULL, value INTEGER NOT NULL, hash BLOB NOT NULL, PRIMARY KEY (band, value, hash)) "
+                "WITHOUT ROWID"
+            )
+            self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.sync_minhashes()
+
+    def __contains__(self, tweet):
+        key = tweet_hash(tweet)
+        with self.lock:
+            if key in self.pending:
+                return True
+            row = self.connection.execute("SELECT 1 FROM used_tweets WHERE hash = ?", (key,)).fetchone()
+        return row is not None
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM used_tweets").fetchone()[0] + len(self.pending)
+
+    def add(self, tweet, timestamp=None):
+        """Queue a tweet; it counts as used from now on but is only written by commit"""
+        key = tweet_hash(tweet)
+        timestamp = timestamp or time.strftime('%Y-%m-%d %H:%M:%S')
+        signature = tweet_minhash(tweet)
+        with self.lock:
+            if key in self.pending:
+                return
+            self.pending[key] = (tweet, timestamp, signature)
+            if signature is not None:
+                self.pending_minhashes.add(signature)
+
+    def commit(self, tweets=None):
+        """Write queued tweets in one transaction: all of them, or only those in tweets"""
+        with self.lock:
+            if tweets is None:
+                keys = list(self.pending)
+            else:
+                keys = [key for key in dict.fromkeys(map(tweet_hash, tweets)) if key in self.pending]
+            if not keys:
+                return
+            rows = [(key, *self.pending[key]) for key in keys]
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO used_tweets (hash, tweet, timestamp) VALUES (?, ?, ?)",
+                    [(key, tweet, timestamp) for key, tweet, timestamp, _ in rows]
+                )
+                self.insert_minhashes((key, signature) for key, _, _, signature in rows)
+            for key in keys:
+                del self.pending[key]
+            self.index_pending()
+
+    def discard(self):
+        """Drop queued tweets that were never committed, so a later run can use them again"""
+        with self.lock:
+            self.pending.clear()
+            self.index_pending()
+
+    def index_pending(self):
+        self.pending_minhashes = MinHashIndex(self.min_similarity)
+        for _, _, signature in self.pending.values():
+            if signature is not None:
+                self.pending_minhashes.add(signature)
+
+    def insert_minhashes(self, rows):
+        """Store MinHash signatures and their band values (call inside a transaction)"""
+        rows = [(key, signature) for key, signature in rows if signature is not None]
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO minhashes (hash, signature) VALUES (?, ?)",
+            [(key, signature.tobytes()) for key, signature in rows]
+        )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO minhash_bands (band, value, hash) VALUES (?, ?, ?)",
+            [(band, value, key) for key, signature in rows for band, value in enumerate(minhash_bands(signature))]
+        )
+
+    def sync_minhashes(self):
+        """Compute signatures for stored tweets that lack them, rebuilding if the band layout changed"""
+        layout = f"{MINHASH_BANDS}x{MINHASH_ROWS}"
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'minhash_layout'").fetchone()
+        with self.connection:
+            if row is None or row[0] != layout:
+                self.connection.execute("DELETE FROM minhashes")
+                self.connection.execute("DELETE FROM minhash_bands")
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('minhash_layout', ?)", (layout,)
+                )
+            missing = self.connection.execute(
+                "SELECT u.hash, u.tweet FROM used_tweets u LEFT JOIN minhashes m ON m.hash = u.hash "
+                "WHERE m.hash IS NULL"
+            ).fetchall()
+            if missing:
+                self.insert_minhashes((key, tweet_minhash(tweet)) for key, tweet in missing)
+
+    def find_near_duplicate(self, signature, min_similarity=None):
+        """Return a used tweet's signature at least min_similarity similar, or None"""
+        if min_similarity is None:
+            min_similarity = self.min_similarity
+        bands = minhash_bands(signature)
+        conditions = " OR ".join("(b.band = ? AND b.value = ?)" for _ in bands)
+        parameters = [value for band, band_value in enumerate(bands) for value in (band, band_value)]
+        with self.lock:
+            pending = self.pending_minhashes.find_near(signature)
+            if pending is not None and minhash_similarity(pending, signature) >= min_similarity:
+                return pending
+            candidates = self.connection.execute(
+                f"SELECT DISTINCT m.signature FROM minhash_bands b JOIN minhashes m ON m.hash = b.hash "
+                f"WHERE {conditions}",
+                parameters
+            ).fetchall()
 
-def save_used_tweet(csv_filename, tweet):
-    """Save new tweet to CSV"""
-    df = pd.DataFrame({'tweet': [tweet], 'timestamp': [time.strftime('%Y-%m-%d %H:%M:%S')]})
-    df.to_csv(csv_filename, mode='a', header=not os.path.exists(csv_filename), index=False)
+        for (blob,) in candidates:
+            candidate = array.array('I')
+            candidate.frombytes(blob)
+            if minhash_similarity(candidate, signature) >= min_similarity:
+                return candidate
+        return None
+
+    def import_csv(self, csv_filename):
+        """Import a used_tweets.csv history once; returns the number of rows read"""
+        source = os.path.abspath(csv_filename)
+        if not os.path.exists(source):
+            return 0
+        with self.lock:
+            if self.connection.execute("SELECT 1 FROM imports WHERE filename = ?", (source,)).fetchone():
+                return 0
+
+        imported = 0
+        with open(source, newline='', encoding='utf-8') as f:
+            for row in csv.reader(f):
+                # Older files were written without a header row
+                if not row or row[0] == 'tweet':
+                    continue
+                clean_text = clean_tweet_text(row[0])
+                if clean_text:
+                    self.add(clean_text, row[1] if len(row) > 1 else None)
+                    imported += 1
+
+        self.commit()
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT INTO imports (filename, timestamp) VALUES (?, ?)",
+                (source, time.strftime('%Y-%m-%d %H:%M:%S'))
+            )
+        print(f"Imported {imported} used tweets from {csv_filename}")
+        return imported
+
+    def close(self):
+        """Close the database; queued tweets that were never committed are dropped"""
+        with self.lock:
+            self.pending.clear()
+            self.connection.close()
 
 def get_user_search_terms():
     """Get search terms from user"""
@@ -636,16 +2550,324 @@ def build_search_query(search_terms):
     query = ' OR '.join(f'"{term}"' for term in search_terms)
     return f"https://twitter.com/search?q={query}&src=typed_query&f=live"
 
-def main():
-    """Main execution flow"""
-    ensure_blog_directory()
+def scrape_tweets(driver, used_tweets, search_terms, username, password, on_keyword_complete=None):
+    """Collect new tweets for every search term, on the worker pool when SCRAPE_WORKERS is set"""
+    if SCRAPE_WORKERS > 0:
+        return scrape_keywords_with_pool(
+            used_tweets, search_terms, username, password, on_keyword_complete=on_keyword_complete
+        )
+    
+    # Login to Twitter, reusing the saved session when it is still valid
+    ensure_logged_in(driver, username, password)
     
+    # Build and execute search
+    search_url = build_search_query(search_terms)
+    search_latest_ai_news(driver, search_url)
+    
+    # Extract tweets
+    matcher = KeywordMatcher(search_terms)
+    with span("extraction", keywords=len(search_terms)) as extraction_span:
+        tweets_by_keyword = extract_new_tweets(
+            driver, used_tweets, search_terms, matcher=matcher, on_keyword_complete=on_keyword_complete
+        )
+        tweet_count = sum(len(tweets) for tweets in tweets_by_keyword.values())
+        extraction_span.set(tweets=tweet_count)
+    count("tweets_extracted", tweet_count)
+    return tweets_by_keyword
+
+def run_pipeline(search_terms, driver, used_tweets, username, password, keep_keywords=None):
+    """Scrape, generate and save blogs for search_terms once; returns the saved blogs.
+
+    The driver and used-tweet store stay open so callers can reuse them.
+    keep_keywords lists the keywords whose blogs are kept (default search_terms).
+    """
+    # Only keywords whose inputs changed since the last run are regenerated
+    manifest = BlogManifest()
+    input_hashes = {}
+    selected_tweets = {}
+    wait_start = len(wait_timings)
+    
+    def select_tweets(keyword, tweets):
+        """Reserve a keyword's tweets for this run; returns the tweets to regenerate its blog from, or None"""
+        # Without new tweets the blog is rebuilt from its saved tweets if its other inputs changed
+        tweets = tweets or manifest.saved_tweets(keyword)
+        # Queued tweets are skipped by the other keywords but only committed once
+        # the blog is saved, so a rerun after a crash sends the same prompt again
+        for tweet in tweets:
+            used_tweets.add(tweet)
+        selected_tweets[keyword] = tweets
+        input_hashes[keyword] = blog_input_hash(keyword, tweets)
+        if manifest.needs_update(keyword, tweets, input_hashes[keyword]):
+            return tweets
+        print(f"Blog for {keyword} is up to date, skipping")
+        used_tweets.commit(tweets)
+        return None
+    
+    def record_blog(blog, filepath):
+        keyword = blog["keyword"]
+        # Without an image generator nothing was requested, so there is nothing to retry
+        images_missing = len(blog["images"]) < blog.get("images_requested", 0)
+        manifest.record(keyword, input_hashes[keyword], filepath, images_missing, selected_tweets[keyword])
+        used_tweets.commit(selected_tweets[keyword])
+    
+    with span("run", keywords=len(search_terms)):
+        try:
+            if STREAMING_PIPELINE:
+                def scrape(on_keyword_ready):
+                    def keyword_ready(keyword, tweets):
+                        tweets = select_tweets(keyword, tweets)
+                        if tweets is not None:
+                            on_keyword_ready(keyword, tweets)
+                    scrape_tweets(driver, used_tweets, search_terms, username, password, keyword_ready)
+                
+                failed_keywords = []
+                blogs = run_streaming_pipeline(
+                    scrape, on_blog_saved=record_blog,
+                    on_keyword_failed=lambda keyword, error: failed_keywords.append(keyword)
+                )
+                if failed_keywords:
+                    print(f"No blog for: {', '.join(failed_keywords)} (their tweets stay available for the next run)")
+            else:
+                tweets_by_keyword = scrape_tweets(driver, used_tweets, search_terms, username, password) or {}
+                
+                # Generate and save blogs for the keywords whose inputs changed
+                changed = {}
+                for keyword, tweets in tweets_by_keyword.items():
+                    tweets = select_tweets(keyword, tweets)
+                    if tweets is not None:
+                        changed[keyword] = tweets
+                blogs = generate_blogs_concurrently(changed) if changed else []
+                for blog, filepath in zip(blogs, save_blogs_to_word(blogs)):
+                    if filepath:
+                        record_blog(blog, filepath)
+        finally:
+            # Tweets of blogs that were not saved stay available for the next run
+            used_tweets.discard()
+        manifest.prune(keep_keywords or search_terms)
+        if not blogs:
+            print("\nNo new relevant tweets found. Try again later or modify your search terms.")
+            return blogs
+        
+        for label, (seconds, waits) in summarize_wait_timings(since=wait_start).items():
+            print(f"Waited {seconds:.1f}s for {label} ({waits} waits)")
+        cache_stats = get_completion_cache().stats()
+        print(f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        print("\nBlog generation complete! Check the blogs directory for the new files.")
+        return blogs
+
+def get_twitter_credentials():
+    """Twitter username and password from the environment, or (None, None)"""
     # Get Twitter credentials from config.py
     twitter_username = os.getenv('TWITTER_USERNAME')
     twitter_password = os.getenv('TWITTER_PASSWORD')
     
     if not all([twitter_username, twitter_password]):
         print("Please set TWITTER_USERNAME and TWITTER_PASSWORD in your .env file")
+        return None, None
+    return twitter_username, twitter_password
+
+def parse_cron_field(field, low, high):
+    """Values allowed by one cron field: *, */n, a, a-b, a-b/n and comma lists"""
+    values = set()
+    for part in field.split(','):
+        value_range, _, step = part.partition('/')
+        try:
+            if value_range == '*':
+                start, end = low, high
+            elif '-' in value_range:
+                start, end = (int(value) for value in value_range.split('-', 1))
+            else:
+                start = int(value_range)
+                end = high if step else start
+            step = int(step) if step else 1
+        except ValueError:
+            raise ValueError(f"Invalid cron field {field!r}") from None
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(f"Invalid cron field {field!r}")
+        values.update(range(start, end + 1, step))
+    return values
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week"""
+
+    def __init__(self, expression):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: {expression!r}")
+        self.expression = expression
+        self.minutes = parse_cron_field(fields[0], 0, 59)
+        self.hours = parse_cron_field(fields[1], 0, 23)
+        self.days = parse_cron_field(fields[2], 1, 31)
+        self.months = parse_cron_field(fields[3], 1, 12)
+        # Both 0 and 7 mean Sunday
+        self.weekdays = {value % 7 for value in parse_cron_field(fields[4], 0, 7)}
+        # As in cron, a restricted day of month or day of week is enough on its own
+        self.any_day = fields[2] == '*' or fields[4] == '*'
+
+    def matches(self, moment):
+        day_match = moment.tm_mday in self.days
+        weekday_match = (moment.tm_wday + 1) % 7 in self.weekdays
+        return (
+            moment.tm_min in self.minutes and moment.tm_hour in self.hours and moment.tm_mon in self.months
+            and ((day_match and weekday_match) if self.any_day else (day_match or weekday_match))
+        )
+
+    def next_run(self, after, last_run=None):
+        """First matching minute (epoch seconds, local time) after the given time"""
+        candidate = (int(after) // 60 + 1) * 60
+        # Searching minute by minute is fast enough for a schedule checked once per run
+        for _ in range(366 * 24 * 60):
+            if self.matches(time.localtime(candidate)):
+                return candidate
+            candidate += 60
+        raise ValueError(f"Cron expression {self.expression!r} never matches")
+
+class IntervalSchedule:
+    """Run every interval_minutes, starting straight away"""
+
+    def __init__(self, interval_minutes):
+        self.interval = interval_minutes * 60
+
+    def next_run(self, after, last_run=None):
+        return after if last_run is None else last_run + self.interval
+
+def load_daemon_jobs(config_file=None, keywords=None, interval_minutes=None, cron=None):
+    """Keyword sets and their schedules from the config file or the command line.
+
+    The config file is JSON: {"jobs": [{"keywords": [...], "interval_minutes": 30}
+    or {"keywords": [...], "cron": "0 */2 * * *"}]}. Returns None if it cannot be read.
+    """
+    if keywords:
+        entries = [{"keywords": keywords, "interval_minutes": interval_minutes, "cron": cron}]
+    else:
+        config_file = config_file or DAEMON_CONFIG
+        try:
+            with open(config_file) as f:
+                entries = json.load(f).get("jobs", [])
+        except FileNotFoundError:
+            print(f"No daemon config found at {config_file}. Pass --keywords or create it (see README).")
+            return None
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Error reading daemon config {config_file}: {e}")
+            return None
+
+    if not isinstance(entries, list):
+        print(f"Daemon config {config_file}: \"jobs\" must be a list")
+        return None
+
+    jobs = []
+    for number, entry in enumerate(entries, 1):
+        if not isinstance(entry, dict):
+            print(f"Daemon job {number} must be an object with \"keywords\", got {entry!r}")
+            return None
+        entry_keywords = entry.get("keywords", [])
+        if not isinstance(entry_keywords, list) or not all(isinstance(keyword, str) for keyword in entry_keywords):
+            print(f"Daemon job {number}: \"keywords\" must be a list of strings, got {entry_keywords!r}")
+            return None
+        job_keywords = [keyword.strip() for keyword in entry_keywords if keyword.strip()]
+        if not job_keywords:
+            continue
+        try:
+            if entry.get("cron"):
+                schedule = CronSchedule(entry["cron"])
+                # Catches expressions such as "0 0 31 2 *" that parse but never run
+                schedule.next_run(time.time())
+            else:
+                interval_minutes = float(entry.get("interval_minutes") or DAEMON_INTERVAL_MINUTES)
+                if interval_minutes <= 0:
+                    raise ValueError(f"Interval must be positive: {interval_minutes}")
+                schedule = IntervalSchedule(interval_minutes)
+        except (TypeError, ValueError, AttributeError) as e:
+            print(f"Daemon job {number} ({', '.join(job_keywords)}): {e}")
+            return None
+        jobs.append({"keywords": job_keywords, "schedule": schedule, "next_run": None, "last_run": None})
+    return jobs
+
+def driver_is_alive(driver):
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+def run_daemon(jobs, once=False):
+    """Run every job on its schedule, keeping Chrome, the API clients and caches warm between runs"""
+    if not jobs:
+        print("No keyword sets configured. Exiting...")
+        return
+    twitter_username, twitter_password = get_twitter_credentials()
+    if not twitter_username:
+        return
+    
+    ensure_blog_directory()
+    used_tweets = UsedTweetStore(USED_TWEETS_DB)
+    used_tweets.import_csv(USED_TWEETS_CSV)
+    # Blogs of every job are kept, not just those of the job that ran
+    all_keywords = list(dict.fromkeys(keyword for job in jobs for keyword in job["keywords"]))
+    driver = None
+    now = time.time()
+    for job in jobs:
+        job["next_run"] = job["schedule"].next_run(now)
+    
+    try:
+        while True:
+            job = min(jobs, key=lambda job: job["next_run"])
+            delay = job["next_run"] - time.time()
+            if delay > 0 and not once:
+                next_run = time.strftime('%Y-%m-%d %H:%M', time.localtime(job["next_run"]))
+                print(f"Next run for {', '.join(job['keywords'])} at {next_run}")
+                time.sleep(delay)
+            
+            job["last_run"] = time.time()
+            try:
+                # A crashed or closed browser is replaced before the run rather than failing it;
+                # if Chrome cannot start, the run fails and the next one tries again
+                if SCRAPE_WORKERS == 0 and (driver is None or not driver_is_alive(driver)):
+                    if driver is not None:
+                        print("Chrome driver stopped responding, restarting it")
+                        try:
+                            driver.quit()
+                        except Exception:
+                            pass
+                        driver = None
+                    driver = create_driver(headless=True)
+                run_pipeline(job["keywords"], driver, used_tweets, twitter_username, twitter_password, all_keywords)
+            except Exception as e:
+                print(f"Error running keywords {', '.join(job['keywords'])}: {e}")
+                # Start the next run with a fresh browser
+                if driver is not None:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = None
+            finally:
+                write_metrics()
+                # Per-run measurements would otherwise grow for as long as the daemon runs
+                wait_timings.clear()
+                completion_stats.clear()
+            
+            if once:
+                jobs.remove(job)
+                if not jobs:
+                    return
+            else:
+                job["next_run"] = job["schedule"].next_run(time.time(), job["last_run"])
+    
+    except KeyboardInterrupt:
+        print("\nStopping daemon")
+    finally:
+        used_tweets.close()
+        if driver:
+            driver.quit()
+        write_metrics()
+
+def main():
+    """Main execution flow"""
+    ensure_blog_directory()
+    
+    twitter_username, twitter_password = get_twitter_credentials()
+    if not twitter_username:
         return
     
     # Get search terms from user
@@ -654,44 +2876,174 @@ def main():
         print("No search terms provided. Exiting...")
         return
     
-    # Initialize Chrome driver
-    service = Service(PATH)
-    driver = webdriver.Chrome(service=service)
+    # Initialize Chrome driver (the worker pool starts its own)
+    driver = None if SCRAPE_WORKERS > 0 else create_driver()
+    
+    # Load previously used tweets (the CSV history is imported on first run)
+    used_tweets = UsedTweetStore(USED_TWEETS_DB)
+    used_tweets.import_csv(USED_TWEETS_CSV)
     
     try:
-        # Load previously used tweets
-        used_tweets = load_used_tweets('used_tweets.csv')
-        
-        # Login to Twitter
-        login_to_twitter(driver, twitter_username, twitter_password)
-        
-        # Build and execute search
-        search_url = build_search_query(search_terms)
-        search_latest_ai_news(driver, search_url)
-        
-        # Extract tweets and generate blogs
-        tweets_by_keyword = extract_new_tweets(driver, used_tweets, search_terms)
-        if tweets_by_keyword:
-            # Save new tweets to CSV
-            for keyword, tweets in tweets_by_keyword.items():
-                for tweet in tweets:
-                    save_used_tweet('used_tweets.csv', tweet)
-            
-            # Generate and save blogs
-            delete_previous_blog_files()
-            blogs = []
-            for keyword, tweets in tweets_by_keyword.items():
-                blog = generate_blog_with_images(keyword, tweets)
-                if blog:
-                    blogs.append(blog)
-            save_blogs_to_word(blogs)
-            
-            print("\nBlog generation complete! Check the blogs directory for the new files.")
-        else:
-            print("\nNo new relevant tweets found. Try again later or modify your search terms.")
+        run_pipeline(search_terms, driver, used_tweets, twitter_username, twitter_password)
+    
+    finally:
+        used_tweets.close()
+        if driver:
+            driver.quit()
+        write_metrics()
+
+def measure_import_time(runs=5):
+    """Fastest of several "import stockmarket" timings in fresh interpreters, in milliseconds"""
+    code = "import time; start = time.perf_counter(); import stockmarket; print(time.perf_counter() - start)"
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]) * 1000)
+    return min(timings)
+
+def scrape_command(args):
+    """Scrape new tweets for the keywords and write them to a JSON file"""
+    twitter_username, twitter_password = get_twitter_credentials()
+    if not twitter_username:
+        return 1
+    if args.keywords:
+        # Same rules as load_daemon_jobs: "AI, NVDA," is ["AI", "NVDA"]
+        search_terms = [keyword.strip() for keyword in args.keywords.split(',') if keyword.strip()]
+    else:
+        search_terms = get_user_search_terms()
+    if not search_terms:
+        print("No search terms provided. Exiting...")
+        return 1
+    
+    driver = None if SCRAPE_WORKERS > 0 else create_driver()
+    used_tweets = UsedTweetStore(USED_TWEETS_DB)
+    used_tweets.import_csv(USED_TWEETS_CSV)
+    try:
+        tweets_by_keyword = scrape_tweets(driver, used_tweets, search_terms, twitter_username, twitter_password)
+        for tweets in tweets_by_keyword.values():
+            for tweet in tweets:
+                used_tweets.add(tweet)
+        used_tweets.commit()
+    finally:
+        used_tweets.close()
+        if driver:
+            driver.quit()
+        write_metrics()
     
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(tweets_by_keyword, f, indent=2)
+    print(f"Saved {sum(len(tweets) for tweets in tweets_by_keyword.values())} tweets to {args.output}")
+    return 0
+
+def generate_command(args):
+    """Generate blogs and images from a tweets file and write them to a blogs file"""
+    with open(args.input, encoding='utf-8') as f:
+        tweets_by_keyword = json.load(f)
+    blogs = generate_blogs_concurrently(tweets_by_keyword)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump([
+            {"keyword": blog["keyword"], "content": blog["content"], "images": blog["images"]} for blog in blogs
+        ], f, indent=2)
+    print(f"Saved {len(blogs)} blogs to {args.output}")
+    write_metrics()
+    return 0
+
+def render_command(args):
+    """Write Word documents for the blogs in a blogs file"""
+    with open(args.input, encoding='utf-8') as f:
+        blogs = json.load(f)
+    for blog in blogs:
+        blog["images"] = [tuple(image) for image in blog.get("images", [])]
+    filepaths = save_blogs_to_word(blogs)
+    write_metrics()
+    return 0 if all(filepaths) else 1
+
+def dedupe_import_command(args):
+    """Import a used-tweets CSV into the SQLite history"""
+    used_tweets = UsedTweetStore(args.db)
+    try:
+        used_tweets.import_csv(args.csv)
+        print(f"{len(used_tweets)} used tweets in {args.db}")
     finally:
-        driver.quit()
+        used_tweets.close()
+    return 0
+
+def import_time_command(args):
+    """Check the import time of this module against IMPORT_TIME_BUDGET_MS"""
+    milliseconds = measure_import_time(args.runs)
+    within_budget = milliseconds <= args.budget
+    print(f"import stockmarket: {milliseconds:.1f} ms (budget {args.budget:.0f} ms){'' if within_budget else ' OVER BUDGET'}")
+    return 0 if within_budget else 1
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Turn recent tweets into blog posts")
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser("run", help="ask for search terms, then scrape, generate and save blogs (the default)")
+
+    scrape = commands.add_parser("scrape", help="scrape new tweets into a JSON file")
+    scrape.add_argument("--keywords", help="comma-separated keywords (asks when omitted)")
+    scrape.add_argument("--output", default="tweets.json")
+
+    generate = commands.add_parser("generate", help="generate blogs and images from a tweets file")
+    generate.add_argument("--input", default="tweets.json")
+    generate.add_argument("--output", default="blogs.json")
+
+    render = commands.add_parser("render", help="write Word documents from a blogs file")
+    render.add_argument("--input", default="blogs.json")
+
+    dedupe_import = commands.add_parser("dedupe-import", help="import a used-tweets CSV into the SQLite history")
+    dedupe_import.add_argument("--csv", default=USED_TWEETS_CSV)
+    dedupe_import.add_argument("--db", default=USED_TWEETS_DB)
+
+    # Everything after "bench" is left for benchmark.py's own parser
+    commands.add_parser("bench", help="run benchmark.py; other arguments are passed on to it", add_help=False)
+
+    import_time = commands.add_parser("import-time", help="check how long importing this module takes")
+    import_time.add_argument("--runs", type=int, default=5)
+    import_time.add_argument("--budget", type=float, default=IMPORT_TIME_BUDGET_MS, help="milliseconds")
+
+    daemon = commands.add_parser("daemon", help="run keyword sets on a schedule")
+    daemon.add_argument("--config", help=f"JSON file with the keyword sets and schedules (default {DAEMON_CONFIG})")
+    daemon.add_argument("--keywords", help="comma-separated keywords for a single keyword set")
+    daemon.add_argument("--interval", type=float, help=f"minutes between runs (default {DAEMON_INTERVAL_MINUTES})")
+    daemon.add_argument("--cron", help='five-field cron schedule, e.g. "*/30 8-18 * * 1-5"')
+    daemon.add_argument("--once", action="store_true", help="run every keyword set once, then exit")
+
+    args, extra_args = parser.parse_known_args(argv)
+    if args.command == "bench":
+        args.bench_args = extra_args
+    elif extra_args:
+        parser.error(f"unrecognized arguments: {' '.join(extra_args)}")
+    return args
+
+def cli(argv=None):
+    """Dispatch a subcommand; returns the exit status"""
+    args = parse_args(argv)
+    if args.command == "scrape":
+        return scrape_command(args)
+    if args.command == "generate":
+        return generate_command(args)
+    if args.command == "render":
+        return render_command(args)
+    if args.command == "dedupe-import":
+        return dedupe_import_command(args)
+    if args.command == "import-time":
+        return import_time_command(args)
+    if args.command == "bench":
+        import benchmark
+        return 0 if benchmark.main(args.bench_args) else 1
+    if args.command == "daemon":
+        keywords = args.keywords.split(',') if args.keywords else None
+        jobs = load_daemon_jobs(args.config, keywords, args.interval, args.cron)
+        if jobs is None:
+            return 1
+        run_daemon(jobs, once=args.once)
+        return 0
+    main()
+    return 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(cli())
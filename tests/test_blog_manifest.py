@@ -0,0 +1,29 @@
+import stockmarket
+
+
+def saved_manifest(tmp_path, images_missing=False):
+    filepath = tmp_path / "blog_ai_1.docx"
+    filepath.write_text("docx")
+    manifest = stockmarket.BlogManifest(str(tmp_path / "blog_manifest.json"))
+    tweets = ["ai chips sell out again", "new model tops the benchmarks"]
+    manifest.record("ai", stockmarket.blog_input_hash("ai", tweets), str(filepath), images_missing, tweets)
+    return manifest, tweets
+
+
+def test_unchanged_keyword_is_kept(tmp_path):
+    manifest, tweets = saved_manifest(tmp_path)
+    reloaded = stockmarket.BlogManifest(manifest.filename)
+    assert reloaded.saved_tweets("ai") == tweets
+    assert not reloaded.needs_update("ai", reloaded.saved_tweets("ai"))
+
+
+def test_prompt_change_regenerates_without_new_tweets(tmp_path, monkeypatch):
+    manifest, _ = saved_manifest(tmp_path)
+    monkeypatch.setattr(stockmarket, "BLOG_PROMPT_VERSION", stockmarket.BLOG_PROMPT_VERSION + 1)
+    assert manifest.needs_update("ai", manifest.saved_tweets("ai"))
+
+
+def test_missing_images_are_retried_without_new_tweets(tmp_path):
+    manifest, _ = saved_manifest(tmp_path, images_missing=True)
+    assert manifest.needs_update("ai", [])
+    assert manifest.needs_update("ai", manifest.saved_tweets("ai"))
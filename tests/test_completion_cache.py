@@ -0,0 +1,68 @@
+import pytest
+
+import stockmarket
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(stockmarket.time, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = stockmarket.CompletionCache(str(tmp_path / "llm_cache.db"), mode="on", ttl_seconds=60)
+    cache.put("key", "blog")
+    clock.now += 59
+    assert cache.get("key") == "blog"
+    clock.now += 2
+    assert cache.get("key") is None
+    assert cache.stats() == {"hits": 1, "misses": 1}
+
+
+def test_least_recently_used_entries_are_evicted_past_max_bytes(tmp_path, clock):
+    cache = stockmarket.CompletionCache(str(tmp_path / "llm_cache.db"), mode="on", ttl_seconds=3600, max_bytes=25)
+    cache.put("first", "a" * 10)
+    clock.now += 1
+    cache.put("second", "b" * 10)
+    clock.now += 1
+    # Reading first makes second the least recently used entry
+    assert cache.get("first") == "a" * 10
+    clock.now += 1
+    cache.put("third", "c" * 10)
+    assert cache.get("second") is None
+    assert cache.get("first") == "a" * 10
+    assert cache.get("third") == "c" * 10
+
+
+def test_off_mode_stores_nothing(tmp_path, clock):
+    cache = stockmarket.CompletionCache(str(tmp_path / "llm_cache.db"), mode="off")
+    cache.put("key", "blog")
+    assert cache.get("key") is None
+
+
+def test_replay_mode_serves_expired_entries_and_raises_on_a_miss(tmp_path, clock, monkeypatch):
+    db_filename = str(tmp_path / "llm_cache.db")
+    messages = [{"role": "user", "content": "Write about AI"}]
+    key = stockmarket.CompletionCache.make_key(stockmarket.BLOG_MODEL, messages, 0.7, 4096)
+    stockmarket.CompletionCache(db_filename, mode="on", ttl_seconds=60).put(key, "cached blog")
+    clock.now += 3600
+
+    def no_client():
+        raise AssertionError("replay mode must not call Groq")
+
+    monkeypatch.setattr(stockmarket, "get_client", no_client)
+    monkeypatch.setattr(
+        stockmarket, "completion_cache", stockmarket.CompletionCache(db_filename, mode="replay", ttl_seconds=60)
+    )
+    assert stockmarket.create_completion(messages) == "cached blog"
+    with pytest.raises(stockmarket.CompletionCacheMiss):
+        stockmarket.create_completion([{"role": "user", "content": "Write about oil"}])
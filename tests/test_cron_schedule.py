@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+import stockmarket
+
+
+def moment(year, month, day, hour=0, minute=0):
+    return time.localtime(time.mktime((year, month, day, hour, minute, 0, 0, 0, -1)))
+
+
+def test_step_over_the_whole_range():
+    assert stockmarket.parse_cron_field("*/15", 0, 59) == {0, 15, 30, 45}
+    assert stockmarket.parse_cron_field("*/5", 1, 12) == {1, 6, 11}
+
+
+def test_step_over_a_range():
+    assert stockmarket.parse_cron_field("8-18/4", 0, 23) == {8, 12, 16}
+    assert stockmarket.parse_cron_field("10/20", 0, 59) == {10, 30, 50}
+
+
+def test_lists_and_ranges():
+    assert stockmarket.parse_cron_field("1,3-5,30", 0, 59) == {1, 3, 4, 5, 30}
+
+
+@pytest.mark.parametrize("field", ["*/0", "60", "5-1", "x", "1-x", "", "*/-1"])
+def test_invalid_fields_are_rejected(field):
+    with pytest.raises(ValueError, match="Invalid cron field"):
+        stockmarket.parse_cron_field(field, 0, 59)
+
+
+def test_expression_needs_five_fields():
+    with pytest.raises(ValueError):
+        stockmarket.CronSchedule("* * * *")
+
+
+def test_zero_and_seven_both_mean_sunday():
+    sunday = moment(2026, 10, 18, 9, 0)
+    monday = moment(2026, 10, 19, 9, 0)
+    for weekday in ("0", "7"):
+        schedule = stockmarket.CronSchedule(f"0 9 * * {weekday}")
+        assert schedule.matches(sunday)
+        assert not schedule.matches(monday)
+    assert stockmarket.CronSchedule("0 9 * * 5-7").matches(sunday)
+
+
+def test_restricted_day_of_month_or_day_of_week_is_enough():
+    # The 1st of the month or any Monday
+    schedule = stockmarket.CronSchedule("0 0 1 * 1")
+    assert schedule.matches(moment(2026, 10, 1))   # Thursday the 1st
+    assert schedule.matches(moment(2026, 10, 19))  # Monday the 19th
+    assert not schedule.matches(moment(2026, 10, 20))
+
+
+def test_day_fields_are_combined_with_and_when_one_is_a_wildcard():
+    weekdays = stockmarket.CronSchedule("0 0 * * 1-5")
+    assert weekdays.matches(moment(2026, 10, 19))
+    assert not weekdays.matches(moment(2026, 10, 18))
+    first = stockmarket.CronSchedule("0 0 1 * *")
+    assert first.matches(moment(2026, 10, 1))
+    assert not first.matches(moment(2026, 10, 2))
+
+
+def test_next_run_is_the_first_matching_minute_after():
+    schedule = stockmarket.CronSchedule("*/15 9-17 * * 1-5")
+    saturday_noon = time.mktime((2026, 10, 17, 12, 0, 0, 0, 0, -1))
+    assert schedule.next_run(saturday_noon) == time.mktime((2026, 10, 19, 9, 0, 0, 0, 0, -1))
+    monday_nine = time.mktime((2026, 10, 19, 9, 0, 0, 0, 0, -1))
+    assert schedule.next_run(monday_nine) == monday_nine + 15 * 60
+
+
+def test_expression_that_never_matches():
+    with pytest.raises(ValueError, match="never matches"):
+        stockmarket.CronSchedule("0 0 30 2 *").next_run(time.time())
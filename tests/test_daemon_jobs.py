@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+import stockmarket
+
+
+def write_config(tmp_path, config):
+    path = tmp_path / "daemon.json"
+    path.write_text(json.dumps(config))
+    return str(path)
+
+
+def test_jobs_are_loaded_with_their_schedules(tmp_path):
+    config = write_config(tmp_path, {"jobs": [
+        {"keywords": ["AI", " NVDA "], "interval_minutes": 30},
+        {"keywords": ["TSLA"], "cron": "0 9-17 * * 1-5"},
+        {"keywords": []},
+    ]})
+    jobs = stockmarket.load_daemon_jobs(config)
+    assert [job["keywords"] for job in jobs] == [["AI", "NVDA"], ["TSLA"]]
+    assert isinstance(jobs[0]["schedule"], stockmarket.IntervalSchedule)
+    assert isinstance(jobs[1]["schedule"], stockmarket.CronSchedule)
+
+
+@pytest.mark.parametrize("config", [
+    {"jobs": {"keywords": ["AI"]}},
+    {"jobs": ["AI"]},
+    {"jobs": [{"keywords": "AI"}]},
+    {"jobs": [{"keywords": ["AI", 3]}]},
+    {"jobs": [{"keywords": ["AI"], "cron": "*/0 * * * *"}]},
+    {"jobs": [{"keywords": ["AI"], "cron": "0 0 31 2 *"}]},
+    {"jobs": [{"keywords": ["AI"], "interval_minutes": "often"}]},
+    {"jobs": [{"keywords": ["AI"], "interval_minutes": -5}]},
+])
+def test_invalid_config_is_reported(tmp_path, capsys, config):
+    assert stockmarket.load_daemon_jobs(write_config(tmp_path, config)) is None
+    assert "Daemon" in capsys.readouterr().out
+
+
+def test_invalid_cron_from_the_command_line_is_reported(capsys):
+    assert stockmarket.load_daemon_jobs(keywords=["AI"], cron="bad") is None
+    assert "5 fields" in capsys.readouterr().out
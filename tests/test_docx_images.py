@@ -0,0 +1,34 @@
+import io
+import os
+
+from PIL import Image
+
+import stockmarket
+
+
+def png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new("RGB", (768, 768), color).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def test_prepared_image_is_reused_across_cache_hits(tmp_path):
+    cache = stockmarket.ImageCache(str(tmp_path))
+    path = cache.put("a" * 64, png_bytes("red"))
+    prepared = stockmarket.prepare_docx_image(path)
+    modified = os.stat(prepared).st_mtime_ns
+    # A cache hit touches the source file, which must not invalidate the prepared copy
+    cache.get("a" * 64)
+    assert stockmarket.prepare_docx_image(path) == prepared
+    assert os.stat(prepared).st_mtime_ns >= modified
+    assert len(os.listdir(tmp_path / "docx")) == 1
+
+
+def test_regenerated_image_under_the_same_key_is_prepared_again(tmp_path):
+    cache = stockmarket.ImageCache(str(tmp_path))
+    first = stockmarket.prepare_docx_image(cache.put("a" * 64, png_bytes("red")))
+    second = stockmarket.prepare_docx_image(cache.put("a" * 64, png_bytes("blue")))
+    assert first != second
+    with Image.open(second) as image:
+        assert image.size == (600, 600)
+        assert image.getpixel((300, 300))[2] > 200
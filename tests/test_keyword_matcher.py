@@ -0,0 +1,48 @@
+import random
+
+import stockmarket
+
+
+def test_overlapping_keywords_are_all_found():
+    matcher = stockmarket.KeywordMatcher(["AI", "AI chips", "chips", "hip"])
+    assert matcher.find_all("New AI chips ship today") == ["AI", "AI chips", "chips", "hip"]
+
+
+def test_results_follow_keyword_order():
+    matcher = stockmarket.KeywordMatcher(["tesla", "nvidia"])
+    assert matcher.find_all("Nvidia rallies while Tesla slips") == ["tesla", "nvidia"]
+
+
+def test_keyword_that_is_a_suffix_of_another_is_found_through_fail_links():
+    matcher = stockmarket.KeywordMatcher(["abcd", "bc"])
+    assert matcher.find_all("xabcx") == ["bc"]
+
+
+def test_word_boundary_rejects_matches_inside_words():
+    matcher = stockmarket.KeywordMatcher(["ab"], word_boundary=True)
+    assert matcher.find_all("abab") == []
+    assert matcher.find_all("ab-ab") == ["ab"]
+    assert not stockmarket.KeywordMatcher(["AI"], word_boundary=True).matches("said")
+    assert stockmarket.KeywordMatcher(["AI"], word_boundary=True).matches("AI, again")
+
+
+def test_word_boundary_allows_keywords_with_punctuation_at_the_edge():
+    matcher = stockmarket.KeywordMatcher(["$NVDA"], word_boundary=True)
+    assert matcher.find_all("buying $NVDA today") == ["$NVDA"]
+    assert matcher.find_all("x$NVDAx") == []
+
+
+def test_case_sensitive_mode():
+    matcher = stockmarket.KeywordMatcher(["AI"], case_sensitive=True)
+    assert matcher.matches("AI stocks")
+    assert not matcher.matches("ai stocks")
+    assert stockmarket.KeywordMatcher(["AI"]).matches("ai stocks")
+
+
+def test_matches_plain_substring_search():
+    rng = random.Random(3)
+    for _ in range(200):
+        keywords = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(4)]
+        text = "".join(rng.choice("abc ") for _ in range(30))
+        expected = [keyword for keyword in keywords if keyword in text]
+        assert stockmarket.KeywordMatcher(keywords).find_all(text) == expected
@@ -0,0 +1,23 @@
+import stockmarket
+
+
+def test_docx_worker_metrics_reach_the_parent(monkeypatch, tmp_path):
+    metrics_file = tmp_path / "metrics.prom"
+    monkeypatch.setattr(stockmarket, "METRICS_FILE", str(metrics_file))
+    monkeypatch.setattr(stockmarket, "BLOG_DIR", str(tmp_path))
+    monkeypatch.setattr(stockmarket, "metric_counters", {})
+    monkeypatch.setattr(stockmarket, "metric_durations", {})
+    stockmarket.count("documents_saved", 5)
+
+    content = "# Title\n## Section\nBody\n"
+    blogs = [
+        {"keyword": f"kw{index}", "content": content, "tree": stockmarket.parse_blog(content), "images": []}
+        for index in range(4)
+    ]
+    assert all(stockmarket.save_blogs_to_word(blogs, workers=2))
+
+    stockmarket.write_metrics()
+    metrics = metrics_file.read_text().splitlines()
+    assert "stockmarket_documents_saved_total 9" in metrics
+    assert 'stockmarket_span_seconds_count{span="docx_build"} 4' in metrics
+    assert 'stockmarket_span_seconds_count{span="docx_save"} 4' in metrics
@@ -0,0 +1,59 @@
+import pytest
+
+import stockmarket
+
+# (original, one-word edit) pairs at 8, 15 and 25 words
+NEAR_DUPLICATES = [
+    (
+        "Nvidia shares jump after record data center revenue",
+        "Nvidia shares soar after record data center revenue",
+    ),
+    (
+        "Fed officials signal two more rate cuts this year as inflation cools faster than markets expected",
+        "Fed officials signal three more rate cuts this year as inflation cools faster than markets expected",
+    ),
+    (
+        "Apple unveils its new AI features at the developer conference and analysts say the update could drive "
+        "the biggest iPhone upgrade cycle since the pandemic era",
+        "Apple unveils its new AI features at the developer conference and analysts say the update could spark "
+        "the biggest iPhone upgrade cycle since the pandemic era",
+    ),
+]
+
+UNRELATED = [
+    "Nvidia shares jump after record data center revenue",
+    "Oil prices slide as OPEC output rises for a third straight month",
+    "Bitcoin ETF inflows hit a new weekly high while miners sell reserves",
+    "Tesla recalls two million vehicles over an autopilot software issue",
+]
+
+
+@pytest.mark.parametrize("original, edited", NEAR_DUPLICATES)
+def test_index_catches_one_word_edits(original, edited):
+    index = stockmarket.MinHashIndex()
+    index.add(stockmarket.tweet_minhash(original))
+    assert index.find_near(stockmarket.tweet_minhash(edited)) is not None
+
+
+def test_index_keeps_unrelated_tweets():
+    index = stockmarket.MinHashIndex()
+    for text in UNRELATED:
+        signature = stockmarket.tweet_minhash(text)
+        assert index.find_near(signature) is None
+        index.add(signature)
+
+
+@pytest.mark.parametrize("original, edited", NEAR_DUPLICATES)
+def test_store_catches_one_word_edits(tmp_path, original, edited):
+    db_filename = str(tmp_path / "used_tweets.db")
+    store = stockmarket.UsedTweetStore(db_filename)
+    store.add(original)
+    assert store.find_near_duplicate(stockmarket.tweet_minhash(edited)) is not None
+    store.commit()
+    store.close()
+
+    # Committed signatures are found through the SQLite band index
+    store = stockmarket.UsedTweetStore(db_filename)
+    assert store.find_near_duplicate(stockmarket.tweet_minhash(edited)) is not None
+    assert store.find_near_duplicate(stockmarket.tweet_minhash(UNRELATED[1])) is None
+    store.close()
@@ -0,0 +1,52 @@
+import time
+
+import stockmarket
+
+
+def test_ordered_and_unordered_lists_stay_apart():
+    blocks = stockmarket.parse_section_blocks("Intro\n\n1. one\n2. two\n\n- a\n* b\n\n1) x\n- y")
+    assert blocks == [
+        ("paragraph", "Intro"),
+        ("numbered_list", ["one", "two"]),
+        ("bullet_list", ["a", "b"]),
+        ("numbered_list", ["x"]),
+        ("bullet_list", ["y"]),
+    ]
+
+
+def test_numbered_lists_use_list_number_and_restart():
+    content = "# Title\n## First\n1. one\n2. two\n## Second\n1. three\n\n- bullet\n"
+    doc = stockmarket.build_blog_document(
+        {"keyword": "ai", "content": content, "tree": stockmarket.parse_blog(content), "images": []}
+    )
+    numbered = [paragraph for paragraph in doc.paragraphs if paragraph.style.name == "List Number"]
+    assert [paragraph.text for paragraph in numbered] == ["one", "two", "three"]
+    num_ids = [paragraph._p.pPr.numPr.numId.val for paragraph in numbered]
+    assert num_ids[0] == num_ids[1] != num_ids[2]
+    assert [paragraph.text for paragraph in doc.paragraphs if paragraph.style.name == "List Bullet"] == ["bullet"]
+
+
+def sections_of(chunks):
+    sections = []
+    parser = stockmarket.SectionStreamParser(sections.append)
+    for chunk in chunks:
+        parser.feed(chunk)
+    parser.close()
+    return sections
+
+
+def test_streamed_chunks_parse_like_the_whole_text():
+    content = "# Title\nintro\n\n## First\n1. one\n2. two\n\n## Second\n- a\n- b\ntail"
+    expected = sections_of([content])
+    assert [section["heading"] for section in expected] == ["Title", "First", "Second"]
+    for size in (1, 2, 3, 7):
+        assert sections_of([content[start:start + size] for start in range(0, len(content), size)]) == expected
+
+
+def test_long_completions_parse_in_linear_time():
+    lines = [f"## Heading {index}" if index % 10 == 0 else f"Line {index} of the body" for index in range(40000)]
+    start = time.perf_counter()
+    tree = stockmarket.parse_blog("# Title\n" + "\n".join(lines))
+    # The quadratic version took several seconds here
+    assert time.perf_counter() - start < 1.0
+    assert len(tree["sections"]) == 4000
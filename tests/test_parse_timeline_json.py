@@ -0,0 +1,57 @@
+import os
+
+import stockmarket
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "search_timeline.json")
+
+
+def load_records():
+    with open(FIXTURE, encoding="utf-8") as f:
+        return stockmarket.parse_timeline_json(f.read())
+
+
+def test_tweets_come_back_in_timeline_order_once_each():
+    assert [record["id"] for record in load_records()] == [
+        "1790000000000001001",
+        "1790000000000001002",
+        "1790000000000001003",
+        # The retweet 1004 is returned as the tweet it retweets
+        "1790000000000001005",
+        "1790000000000001006",
+        # Quoted by 1006
+        "1790000000000001007",
+        "1790000000000001008",
+    ]
+
+
+def test_record_fields_match_the_dom_extraction():
+    record = load_records()[0]
+    assert record == {
+        "text": "Nvidia beats estimates again & guides higher for Q3 https://t.co/abc123",
+        "id": "1790000000000001001",
+        "author": "marketwatcher",
+        "timestamp": "2024-05-14T15:02:11.000Z",
+        "likes": 120,
+        "retweets": 31,
+        "replies": 12,
+        "quotes": 4,
+        "views": 48210,
+    }
+
+
+def test_long_tweets_use_the_note_text():
+    record = load_records()[2]
+    assert record["text"].endswith("Watch the utilities.")
+
+
+def test_retweets_carry_the_original_text_and_author():
+    record = load_records()[3]
+    assert record["author"] == "chipanalyst"
+    assert not record["text"].startswith("RT @")
+
+
+def test_only_search_timeline_responses_are_read():
+    pattern = stockmarket.TIMELINE_RESPONSE_PATTERN
+    assert pattern.search("https://x.com/i/api/graphql/abc123/SearchTimeline?variables=%7B%7D")
+    assert not pattern.search("https://x.com/i/api/graphql/abc123/HomeTimeline?variables=%7B%7D")
+    assert not pattern.search("https://x.com/i/api/graphql/abc123/HomeLatestTimeline?variables=%7B%7D")
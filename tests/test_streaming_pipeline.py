@@ -0,0 +1,59 @@
+import threading
+
+import stockmarket
+
+
+class DisabledImageGenerator:
+    initialized = False
+
+
+def test_failing_keywords_are_reported_without_stalling(monkeypatch, tmp_path):
+    monkeypatch.setattr(stockmarket, "get_image_generator", DisabledImageGenerator)
+    monkeypatch.setattr(
+        stockmarket, "generate_blog_content",
+        lambda keyword, tweets, on_section=None: None if keyword == "kw3" else "# Title\n## Section\nBody"
+    )
+    monkeypatch.setattr(stockmarket, "BLOG_DIR", str(tmp_path))
+    monkeypatch.setattr(stockmarket, "save_blog_to_word", lambda blog: str(tmp_path / f"{blog['keyword']}.docx"))
+
+    def on_blog_saved(blog, filepath):
+        if blog["keyword"] in ("kw1", "kw6"):
+            raise ValueError("manifest write failed")
+
+    def scrape(on_keyword_ready):
+        for index in range(8):
+            on_keyword_ready(f"kw{index}", ["tweet"])
+
+    failed = []
+    result = []
+    thread = threading.Thread(target=lambda: result.extend(stockmarket.run_streaming_pipeline(
+        scrape, queue_size=1, on_blog_saved=on_blog_saved, docx_workers=1,
+        on_keyword_failed=lambda keyword, error: failed.append(keyword)
+    )), daemon=True)
+    thread.start()
+    thread.join(10)
+
+    assert not thread.is_alive()
+    assert sorted(failed) == ["kw1", "kw3", "kw6"]
+    assert len(result) == 7
+
+
+def test_documents_are_written_by_the_process_pool(monkeypatch, tmp_path):
+    monkeypatch.setattr(stockmarket, "get_image_generator", DisabledImageGenerator)
+    monkeypatch.setattr(stockmarket, "BLOG_DIR", str(tmp_path))
+    monkeypatch.setattr(
+        stockmarket, "generate_blog_content",
+        lambda keyword, tweets, on_section=None: f"# {keyword}\n## Section\n1. one\n2. two"
+    )
+    saved = []
+
+    def scrape(on_keyword_ready):
+        for index in range(4):
+            on_keyword_ready(f"kw{index}", ["tweet"])
+
+    blogs = stockmarket.run_streaming_pipeline(
+        scrape, docx_workers=2, on_blog_saved=lambda blog, filepath: saved.append(filepath)
+    )
+    assert sorted(blog["keyword"] for blog in blogs) == ["kw0", "kw1", "kw2", "kw3"]
+    assert len(saved) == 4 and all(filepath.endswith(".docx") for filepath in saved)
+    assert sorted(path.name.split("_")[1] for path in tmp_path.glob("*.docx")) == ["kw0", "kw1", "kw2", "kw3"]